@@ -1,7 +1,5 @@
 #!/usr/bin/env python
 
-import time
-
 import click
 
 import nedrexdb
@@ -43,10 +41,12 @@ def cli():
 
 @click.option("--conf", required=True, type=click.Path(exists=True))
 @click.option("--download", is_flag=True, default=False)
+@click.option("--blue-green", is_flag=True, default=False)
 @cli.command()
-def update(conf, download):
+def update(conf, download, blue_green):
     print(f"Config file: {conf}")
     print(f"Download updates: {download}")
+    print(f"Blue/green swap: {blue_green}")
 
     nedrexdb.parse_config(conf)
 
@@ -119,13 +119,20 @@ def update(conf, download):
     # Profile the collections
     collection_stats.profile_collections(MongoInstance.DB)
     update_db_version.update_db_version(default_version="2.0.0")
-    time.sleep(60)
+    # Flush all writes to disk before the dev instance is removed (the new
+    # live instance waits until MongoDB and Neo4j accept connections).
+    MongoInstance.CLIENT.admin.command("fsync")
 
     # remove dev instance and set up live instance
     dev_instance.remove()
     live_instance = NeDRexLiveInstance()
-    live_instance.remove()
-    live_instance.set_up(use_existing_volume=True, neo4j_mode="db")
+    if blue_green:
+        # The new live instance is started and warmed up next to the old one,
+        # which keeps serving until the switch.
+        live_instance.blue_green_swap()
+    else:
+        live_instance.remove()
+        live_instance.set_up(use_existing_volume=True, neo4j_mode="db")
 
 
 @click.option("--conf", required=True, type=click.Path(exists=True))
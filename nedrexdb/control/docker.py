@@ -1,9 +1,16 @@
+import os as _os
+import re as _re
 import time as _time
 from abc import ABC as _ABC, abstractmethod as _abstractmethod
 
 import docker as _docker
+import requests as _requests  # type: ignore
+from pymongo import MongoClient as _MongoClient
 
 from nedrexdb import config as _config
+from nedrexdb.control import readiness as _readiness
+from nedrexdb.exceptions import AssumptionError as _AssumptionError, ProcessError as _ProcessError
+from nedrexdb.logger import logger as _logger
 
 _client = _docker.from_env()
 
@@ -20,6 +27,10 @@ def get_neo4j_image():
     return _config["db.neo4j_image"]
 
 
+def get_proxy_image():
+    return _config.get("db.proxy_image") or "nginx:stable-alpine"
+
+
 def generate_mongo_volume_name():
     timestamp = _time.time_ns() // 1_000_000  # time in ms
     volume_name = f"{_config['db.volume_root']}_mongo_{timestamp}"
@@ -60,6 +71,93 @@ def get_neo4j_volumes():
     return volumes
 
 
+_MB = 1024 * 1024
+
+
+def get_host_memory() -> int:
+    """Returns the physical memory of the host, in bytes"""
+    return _os.sysconf("SC_PAGE_SIZE") * _os.sysconf("SC_PHYS_PAGES")
+
+
+def get_neo4j_store_size(volume) -> int:
+    """Returns the size (in bytes) of the Neo4j store in a volume, measured in a short-lived container"""
+    try:
+        output = _client.containers.run(
+            image=get_neo4j_image(),
+            entrypoint=["du", "-sb", "/data/databases"],
+            volumes={volume: {"mode": "ro", "bind": "/data"}},
+            remove=True,
+        )
+    except _docker.errors.ContainerError:
+        _logger.warning(f"unable to determine the size of the Neo4j store in volume {volume!r}")
+        return 0
+    return int(output.split()[0])
+
+
+def _get_neo4j_memory_budget(instances: int = 1) -> int:
+    """Memory for each of `instances` Neo4j servers running at once, in bytes
+
+    `db.neo4j_memory_fraction` (by default, 0.5) is the fraction of the host
+    memory used by all of them together, split evenly between them (a colour
+    started during a blue/green swap keeps its share afterwards, see
+    _NeDRexColourInstance).
+    """
+    # NOTE: Neo4j shares the host with MongoDB (and, while building, the
+    #       parsers), so only a fraction of the host memory is used by default.
+    fraction = _config.get("db.neo4j_memory_fraction") or 0.5
+    return int(get_host_memory() * fraction) // instances
+
+
+def get_neo4j_import_heap_size() -> str:
+    """Heap size for `neo4j-admin import` (HEAP_SIZE), overridden by `db.neo4j_import_heap_size`"""
+    override = _config.get("db.neo4j_import_heap_size")
+    if override:
+        return override
+    heap = min(max(_get_neo4j_memory_budget() // 2, 512 * _MB), 31 * 1024 * _MB)
+    return f"{heap // _MB}m"
+
+
+def neo4j_memory_settings(store_size: int, budget: int) -> dict[str, str]:
+    """Heap and page cache sizes for serving a store of `store_size` bytes within `budget` bytes
+
+    The page cache is sized to hold the whole store (plus 20%), leaving at
+    least half of the budget to the heap; the heap stays below 31 GiB, so that
+    the JVM can use compressed pointers. On small hosts, the minimum heap (512
+    MiB) and page cache (128 MiB) can exceed the budget.
+    """
+    heap = min(max(budget // 2, 512 * _MB), 31 * 1024 * _MB)
+    pagecache = max(min(int(store_size * 1.2), budget - heap), 128 * _MB)
+    if heap + pagecache > budget:
+        _logger.warning(
+            f"Neo4j needs at least {(heap + pagecache) // _MB} MiB, more than its budget of {budget // _MB} MiB"
+        )
+
+    heap_size = _config.get("db.neo4j_heap_size") or f"{heap // _MB}m"
+    pagecache_size = _config.get("db.neo4j_pagecache_size") or f"{pagecache // _MB}m"
+    return {
+        "NEO4J_dbms_memory_heap_initial__size": heap_size,
+        "NEO4J_dbms_memory_heap_max__size": heap_size,
+        "NEO4J_dbms_memory_pagecache_size": pagecache_size,
+    }
+
+
+def get_mongo_cache_size_gb(instances: int) -> float:
+    """WiredTiger cache size for each of `instances` MongoDB servers running at once, in GB
+
+    mongod's default cache (half of the host memory less 1 GB, at least
+    0.25 GB) is split evenly between them.
+    """
+    default = max((get_host_memory() / (1024 * _MB) - 1) / 2, 0.25)
+    return max(round(default / instances, 2), 0.25)
+
+
+def _get_volume_name(container, destination):
+    for mount in container.attrs["Mounts"]:
+        if mount["Type"] == "volume" and mount["Destination"] == destination:
+            return mount["Name"]
+    return None
+
+
 class _NeDRexInstance(_ABC):
     @_abstractmethod
     def set_up(self):
@@ -71,6 +169,10 @@ class _NeDRexInstance(_ABC):
 
 
 class _NeDRexBaseInstance(_NeDRexInstance):
+    # Number of MongoDB / Neo4j servers sharing the host memory while this one runs
+    _mongo_instances = 1
+    _neo4j_instances = 1
+
     @property
     def mongo_container_name(self):
         return _config[f"db.{self.version}.container_name"]
@@ -157,14 +259,23 @@ class _NeDRexBaseInstance(_NeDRexInstance):
             kwargs["stdin_open"] = True
             kwargs["tty"] = True
             kwargs["entrypoint"] = "/bin/bash"
+            # NOTE: Used by neo4j-admin (run with docker exec, see mongo_to_neo).
+            kwargs["environment"]["HEAP_SIZE"] = get_neo4j_import_heap_size()
 
         elif neo4j_mode == "db":
             kwargs["environment"]["NEO4J_dbms_read__only"] = "true"
+            store_size = get_neo4j_store_size(volume) if use_existing_volume else 0
+            budget = _get_neo4j_memory_budget(self._neo4j_instances)
+            kwargs["environment"].update(neo4j_memory_settings(store_size, budget))
         else:
             raise Exception(f"neo4j_mode {neo4j_mode!r} is invalid")
 
         _client.containers.run(**kwargs)
 
+        # NOTE: In import mode, the container runs a shell rather than Neo4j.
+        if neo4j_mode == "db":
+            _readiness.wait_for_neo4j(self.neo4j_http_port, self.neo4j_bolt_port)
+
     def _set_up_mongo(self, use_existing_volume):
         if self.mongo_container:  # if the container already exists, nothing to do
             return
@@ -177,17 +288,24 @@ class _NeDRexBaseInstance(_NeDRexInstance):
         else:
             volume = generate_new_mongo_volume()
 
-        _client.containers.run(
-            image=get_mongo_image(),
-            detach=True,
-            name=self.mongo_container_name,
-            volumes={volume: {"mode": "rw", "bind": "/data/db"}},
-            ports={27017: ("127.0.0.1", self.mongo_port)},
-            network=self.network_name,
-            remove=True,
-        )
+        kwargs = {
+            "image": get_mongo_image(),
+            "detach": True,
+            "name": self.mongo_container_name,
+            "volumes": {volume: {"mode": "rw", "bind": "/data/db"}},
+            "ports": {27017: ("127.0.0.1", self.mongo_port)},
+            "network": self.network_name,
+            "remove": True,
+        }
 
-    def _set_up_express(self):
+        instances = self._mongo_instances
+        if instances > 1:
+            kwargs["command"] = ["--wiredTigerCacheSizeGB", f"{get_mongo_cache_size_gb(instances)}"]
+
+        _client.containers.run(**kwargs)
+        _readiness.wait_for_mongo(self.mongo_port)
+
+    def _set_up_express(self, mongo_server=None):
         if self.express_container:  # if the container already exists, nothing to do
             return
 
@@ -197,7 +315,7 @@ class _NeDRexBaseInstance(_NeDRexInstance):
             name=self.express_container_name,
             ports={8081: ("127.0.0.1", self.express_port)},
             network=self.network_name,
-            environment={"ME_CONFIG_MONGODB_SERVER": self.mongo_container_name},
+            environment={"ME_CONFIG_MONGODB_SERVER": mongo_server or self.mongo_container_name},
             remove=True,
         )
 
@@ -268,11 +386,259 @@ class _NeDRexBaseInstance(_NeDRexInstance):
         self._remove_network()
 
 
+class _NeDRexColourInstance(_NeDRexBaseInstance):
+    """One colour (blue or green) of the live instance in blue/green mode
+
+    The containers are named after the live containers with the colour as a
+    suffix, share the live network, and are published on the live ports
+    shifted by `db.live.colour_port_offset` (blue once, green twice), so that
+    they can be checked before traffic is switched to them.
+    """
+
+    colours = ("blue", "green")
+
+    def __init__(self, colour):
+        if colour not in self.colours:
+            raise ValueError(f"colour {colour!r} is invalid")
+        self.colour = colour
+
+    @property
+    def version(self):
+        return "live"
+
+    # NOTE: During a swap, the new colour is started while the old one (or the
+    #       non blue/green live instance) is still serving, so the memory is
+    #       split between them. The new colour keeps its share after the old
+    #       one is removed, as resizing it would need a restart (and so take
+    #       the live instance down); it is only sized for the whole host when
+    #       nothing else is running.
+    @property
+    def _mongo_instances(self):
+        return 1 + sum(1 for other in self._other_live_instances() if other.mongo_container)
+
+    @property
+    def _neo4j_instances(self):
+        return 1 + sum(1 for other in self._other_live_instances() if other.neo4j_container)
+
+    def _other_live_instances(self):
+        """The other colour, and the non blue/green live instance"""
+        others = [_NeDRexColourInstance(colour) for colour in self.colours if colour != self.colour]
+        return others + [NeDRexLiveInstance()]
+
+    @property
+    def _port_offset(self):
+        offset = _config.get("db.live.colour_port_offset") or 100
+        return offset * (self.colours.index(self.colour) + 1)
+
+    @property
+    def mongo_container_name(self):
+        return f'{_config["db.live.container_name"]}_{self.colour}'
+
+    @property
+    def neo4j_container_name(self):
+        return f"{self.mongo_container_name}_neo4j"
+
+    @property
+    def neo4j_http_port(self):
+        return super().neo4j_http_port + self._port_offset
+
+    @property
+    def neo4j_bolt_port(self):
+        return super().neo4j_bolt_port + self._port_offset
+
+    @property
+    def mongo_port(self):
+        return super().mongo_port + self._port_offset
+
+    def _check_mongo(self):
+        """Reads a document from each node and edge collection, loading it into the cache"""
+        client = _MongoClient(host="localhost", port=self.mongo_port, serverSelectionTimeoutMS=2_000)
+        try:
+            db = client[_config["db.mongo_db"]]
+
+            # NOTE: Not every collection has indexes besides _id (e.g., signature
+            #       and protein_has_signature), so they are not checked here.
+            collections = set(db.list_collection_names())
+            for coll in _config["api.node_collections"] + _config["api.edge_collections"]:
+                if coll not in collections:
+                    continue
+                db[coll].find_one()
+        finally:
+            client.close()
+
+    def _check_neo4j(self):
+        """Runs a sample query against Neo4j over HTTP"""
+        database = _config.get("db.neo4j_database") or "neo4j"
+        response = _requests.post(
+            f"http://localhost:{self.neo4j_http_port}/db/{database}/tx/commit",
+            json={"statements": [{"statement": "MATCH (n) RETURN n LIMIT 1"}]},
+            timeout=30,
+        )
+        response.raise_for_status()
+        errors = response.json().get("errors")
+        if errors:
+            raise _ProcessError(f"sample query against {self.neo4j_container_name!r} failed: {errors}")
+        return True
+
+    def warm_up(self, timeout=None):
+        """Runs the warm-up checks, raising ProcessError if they have not passed after `timeout` seconds"""
+        if timeout is None:
+            timeout = _config.get("db.live.warm_up_timeout") or 600
+
+        # NOTE: The containers are ready (see _set_up_mongo and _set_up_neo4j),
+        #       so a failed MongoDB read is an error rather than something to
+        #       wait for; the Neo4j database may still be starting, though.
+        self._check_mongo()
+        _readiness.wait_until(self._check_neo4j, f"Neo4j sample query ({self.colour})", timeout=timeout)
+
+    def set_up(self, use_existing_volume=True, neo4j_mode="db"):
+        self._set_up_network()
+        self._set_up_mongo(use_existing_volume=use_existing_volume)
+        self._set_up_neo4j(use_existing_volume=use_existing_volume, neo4j_mode=neo4j_mode)
+
+    def remove(self, remove_db_volume=False, remove_configdb_volume=True):
+        # NOTE: The network is shared with the rest of the live instance.
+        self._remove_mongo(
+            remove_db_volume=remove_db_volume,
+            remove_configdb_volume=remove_configdb_volume,
+        )
+        self._remove_neo4j(remove_db_volume=remove_db_volume)
+
+
+class _NeDRexLiveProxy:
+    """nginx (stream) proxy publishing the live ports, and forwarding them to the active colour
+
+    Switching colours rewrites the nginx configuration and reloads nginx, which
+    is atomic for new connections; existing connections are drained by the old
+    worker processes.
+    """
+
+    _ACTIVE_REGEX = _re.compile(r"# active: (\w+)")
+
+    @property
+    def container_name(self):
+        return f'{_config["db.live.container_name"]}_proxy'
+
+    @property
+    def container(self):
+        try:
+            return _client.containers.get(self.container_name)
+        except _docker.errors.NotFound:
+            return None
+
+    def active_colour(self):
+        if not self.container:
+            return None
+
+        _, output = self.container.exec_run(["cat", "/etc/nginx/nginx.conf"])
+        match = self._ACTIVE_REGEX.search(output.decode("utf-8"))
+        return match.group(1) if match else None
+
+    def _generate_config(self, instance):
+        return "\n".join(
+            [
+                "events {}",
+                "stream {",
+                f"    # active: {instance.colour}",
+                f"    server {{ listen 27017; proxy_pass {instance.mongo_container_name}:27017; }}",
+                f"    server {{ listen 7474; proxy_pass {instance.neo4j_container_name}:7474; }}",
+                f"    server {{ listen 7687; proxy_pass {instance.neo4j_container_name}:7687; }}",
+                "}",
+                "",
+            ]
+        )
+
+    def set_up(self, instance):
+        if self.container:
+            return self.switch(instance)
+
+        live = NeDRexLiveInstance()
+        _client.containers.run(
+            image=get_proxy_image(),
+            detach=True,
+            name=self.container_name,
+            command=["sh", "-c", 'printf "%s" "$NGINX_CONF" > /etc/nginx/nginx.conf && exec nginx -g "daemon off;"'],
+            environment={"NGINX_CONF": self._generate_config(instance)},
+            ports={
+                27017: ("127.0.0.1", live.mongo_port),
+                7474: ("127.0.0.1", live.neo4j_http_port),
+                7687: ("127.0.0.1", live.neo4j_bolt_port),
+            },
+            network=live.network_name,
+            remove=True,
+        )
+
+    def switch(self, instance):
+        command = 'printf "%s" "$NGINX_CONF" > /etc/nginx/nginx.conf.new && nginx -t -c /etc/nginx/nginx.conf.new'
+        command += " && mv /etc/nginx/nginx.conf.new /etc/nginx/nginx.conf && nginx -s reload"
+        exit_code, output = self.container.exec_run(
+            ["sh", "-c", command], environment={"NGINX_CONF": self._generate_config(instance)}
+        )
+        if exit_code != 0:
+            raise _ProcessError(f"failed to switch live proxy to {instance.colour}: {output.decode('utf-8')}")
+
+    def remove(self):
+        if self.container:
+            self.container.remove(force=True)
+
+
 class NeDRexLiveInstance(_NeDRexBaseInstance):
     @property
     def version(self):
         return "live"
 
+    def blue_green_swap(self):
+        """Replaces the live instance with one on the newest volumes, without taking the live ports down
+
+        The new colour is started next to the active one and warmed up before
+        the proxy is switched to it; the old colour is only removed afterwards.
+        """
+        self._set_up_network()
+        proxy = _NeDRexLiveProxy()
+
+        active = proxy.active_colour()
+        new = _NeDRexColourInstance("green" if active == "blue" else "blue")
+
+        # NOTE: Two MongoDB servers cannot share a volume, so the new colour
+        #       needs a newer volume than the one being served.
+        current = _NeDRexColourInstance(active) if active else self
+        current_volume = _get_volume_name(current.mongo_container, "/data/db") if current.mongo_container else None
+        if current_volume is not None and current_volume == get_mongo_volumes()[0].name:
+            raise _AssumptionError("the live instance already uses the newest volume, nothing to swap to")
+
+        # Left over from a failed swap
+        new.remove()
+        new.set_up(use_existing_volume=True, neo4j_mode="db")
+        try:
+            new.warm_up()
+        except Exception:
+            new.remove()
+            raise
+
+        if active is None:
+            # NOTE: First swap from a (non blue/green) live instance, which holds
+            #       the live ports; the ports are down until the proxy is up.
+            self._remove_mongo()
+            self._remove_neo4j()
+            self._remove_express()
+            proxy.set_up(new)
+        else:
+            proxy.switch(new)
+        _logger.info(f"Live instance switched to {new.colour}")
+
+        self._set_up_express(mongo_server=proxy.container_name)
+        if active is not None:
+            _NeDRexColourInstance(active).remove()
+
+    def remove(self, remove_db_volume=False, remove_configdb_volume=True):
+        _NeDRexLiveProxy().remove()
+        for colour in _NeDRexColourInstance.colours:
+            _NeDRexColourInstance(colour).remove(
+                remove_db_volume=remove_db_volume,
+                remove_configdb_volume=remove_configdb_volume,
+            )
+        super().remove(remove_db_volume=remove_db_volume, remove_configdb_volume=remove_configdb_volume)
+
 
 class NeDRexDevInstance(_NeDRexBaseInstance):
     @property
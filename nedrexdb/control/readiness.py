@@ -0,0 +1,97 @@
+import socket as _socket
+import struct as _struct
+import time as _time
+from typing import Callable as _Callable, Optional as _Optional
+
+import psycopg2 as _psycopg2
+import requests as _requests  # type: ignore
+from pymongo import MongoClient as _MongoClient
+
+from nedrexdb import config as _config
+from nedrexdb.exceptions import ProcessError as _ProcessError
+from nedrexdb.logger import logger as _logger
+
+# Bolt handshake: magic preamble, followed by four proposed protocol versions
+# (4.4 down to 4.2, 4.0, 3 and none); the server replies with the agreed version.
+_BOLT_HANDSHAKE = b"\x60\x60\xb0\x17" + _struct.pack(">IIII", 0x00020404, 0x00000004, 0x00000003, 0)
+
+
+def wait_until(
+    check: _Callable[[], bool],
+    description: str,
+    timeout: _Optional[float] = None,
+    initial_delay: float = 0.1,
+    max_delay: float = 5.0,
+) -> None:
+    """Polls `check` with exponential backoff until it returns True
+
+    Exceptions raised by `check` count as "not ready". ProcessError is raised
+    if the check has not passed after `timeout` seconds (by default,
+    `db.readiness_timeout`, or 300 seconds).
+    """
+    if timeout is None:
+        timeout = _config.get("db.readiness_timeout") or 300
+
+    start = _time.monotonic()
+    delay = initial_delay
+    while True:
+        try:
+            if check():
+                _logger.debug(f"{description} ready after {_time.monotonic() - start:.1f}s")
+                return
+            reason = "check returned False"
+        except Exception as E:
+            reason = f"{E}"
+
+        elapsed = _time.monotonic() - start
+        if elapsed >= timeout:
+            raise _ProcessError(f"{description} not ready after {timeout}s ({reason})")
+
+        _time.sleep(min(delay, timeout - elapsed))
+        delay = min(delay * 2, max_delay)
+
+
+def mongo_is_ready(port: int, host: str = "localhost") -> bool:
+    client = _MongoClient(host=host, port=port, serverSelectionTimeoutMS=1_000, connectTimeoutMS=1_000)
+    try:
+        client.admin.command("ping")
+        return True
+    finally:
+        client.close()
+
+
+def neo4j_http_is_ready(port: int, host: str = "localhost") -> bool:
+    return _requests.get(f"http://{host}:{port}/", timeout=2).status_code == 200
+
+
+def neo4j_bolt_is_ready(port: int, host: str = "localhost") -> bool:
+    with _socket.create_connection((host, port), timeout=2) as s:
+        s.sendall(_BOLT_HANDSHAKE)
+        response = s.recv(4)
+    return len(response) == 4 and response != b"\x00\x00\x00\x00"
+
+
+def postgres_is_ready(port: int, password: str, host: str = "localhost", user: str = "postgres") -> bool:
+    # NOTE: This connects over TCP (rather than running pg_isready in the
+    #       container), as the server started during the postgres image's
+    #       initialisation only listens on the Unix socket.
+    con = _psycopg2.connect(host=host, port=port, user=user, password=password, connect_timeout=2)
+    try:
+        with con.cursor() as cur:
+            cur.execute("SELECT 1")
+        return True
+    finally:
+        con.close()
+
+
+def wait_for_mongo(port: int, timeout: _Optional[float] = None) -> None:
+    wait_until(lambda: mongo_is_ready(port), f"MongoDB (port {port})", timeout=timeout)
+
+
+def wait_for_neo4j(http_port: int, bolt_port: int, timeout: _Optional[float] = None) -> None:
+    wait_until(lambda: neo4j_http_is_ready(http_port), f"Neo4j HTTP (port {http_port})", timeout=timeout)
+    wait_until(lambda: neo4j_bolt_is_ready(bolt_port), f"Neo4j bolt (port {bolt_port})", timeout=timeout)
+
+
+def wait_for_postgres(port: int, password: str, timeout: _Optional[float] = None) -> None:
+    wait_until(lambda: postgres_is_ready(port, password), f"PostgreSQL (port {port})", timeout=timeout)
@@ -1,9 +1,9 @@
 class MongoMixin:
     @classmethod
-    def find(cls, db, query=None):
+    def find(cls, db, query=None, projection=None):
         if query is None:
             query = {}
-        return db[cls.collection_name].find(query)
+        return db[cls.collection_name].find(query, projection)
 
     @classmethod
     def find_one(cls, db, query=None):
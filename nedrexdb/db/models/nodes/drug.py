@@ -17,6 +17,7 @@ class DrugBase(models.MongoMixin):
     @classmethod
     def set_indexes(cls, db):
         db[cls.collection_name].create_index("primaryDomainId", unique=True)
+        db[cls.collection_name].create_index("domainIds")
 
 
 class Drug(_BaseModel, DrugBase):
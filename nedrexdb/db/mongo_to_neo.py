@@ -125,6 +125,8 @@ def mongo_to_neo(nedrex_instance, db):
         "import",
         f"--array-delimiter={delimiter}",
         "--multiline-fields=true",
+        f"--high-io={str(_config.get('db.neo4j_import_high_io') is not False).lower()}",
+        f"--processors={_config.get('db.neo4j_import_processors') or _os.cpu_count() or 1}",
     ]
     for node in nodes:
         command += ["--nodes", f"/import/{node}.csv"]
@@ -1,6 +1,17 @@
+import json as _json
+import os as _os
+import re as _re
+import subprocess as _subprocess
+from collections import deque as _deque
+from contextlib import contextmanager as _contextmanager
+from itertools import accumulate as _accumulate, islice as _islice
+from operator import indexOf as _indexOf
 from pathlib import Path as _Path
 
+import pandas as _pd
+
 from nedrexdb import config as _config
+from nedrexdb.exceptions import ProcessError as _ProcessError
 
 
 def _get_file_location_factory(database):
@@ -19,3 +30,287 @@ def _get_file_location_factory(database):
         return path
 
     return inner
+
+
+def _get_worker_count() -> int:
+    # NOTE: The number of worker processes used by the parallel parsers can be
+    #       set with `db.parser_workers`; by default, all cores are used.
+    workers = _config.get("db.parser_workers")
+    if workers is None:
+        workers = _os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+@_contextmanager
+def _gunzip_stream(path):
+    """Context manager yielding a binary stream of a gzipped file, decompressed in a separate process
+
+    Raises ProcessError if gzip fails (e.g., for a truncated or corrupt file).
+    """
+    p = _subprocess.Popen(["gzip", "-dc", f"{path}"], stdout=_subprocess.PIPE)
+    try:
+        yield p.stdout
+    except BaseException:
+        p.stdout.close()
+        p.kill()
+        p.wait()
+        raise
+
+    # NOTE: Any remaining output is drained so that gzip runs to completion
+    #       (rather than failing on a closed pipe), and reports corrupt data.
+    while p.stdout.read(1024 * 1024):
+        pass
+    p.stdout.close()
+    if p.wait() != 0:
+        raise _ProcessError(f"gzip exited with status {p.returncode} while decompressing {path}")
+
+
+def _iter_line_blocks(f, block_size: int = 4 * 1024 * 1024):
+    """Splits a binary stream into blocks of complete lines"""
+    remainder = b""
+    while True:
+        data = f.read(block_size)
+        if not data:
+            break
+
+        data = remainder + data
+        end = data.rfind(b"\n") + 1
+        if end:
+            yield data[:end]
+        remainder = data[end:]
+
+    if remainder:
+        yield remainder
+
+
+def _iter_tsv_chunks(path, chunksize: int = 500_000, **kwargs):
+    """Reads a (possibly compressed) TSV file into DataFrames of `chunksize` rows
+
+    Fields are read as strings (unless `dtype` is given), with empty fields
+    kept as "" rather than NaN; other `kwargs` are passed to `pd.read_csv`.
+    """
+    # NOTE: Chunks are mapped to NeDRexDB IDs with `Series.map`, which calls
+    #       `__missing__` on dict subclasses (e.g., defaultdict); the mappings
+    #       are converted to plain dicts first.
+    kwargs = {"sep": "\t", "dtype": str, "keep_default_na": False, **kwargs}
+    return _pd.read_csv(path, chunksize=chunksize, **kwargs)
+
+
+def _iter_xml_blocks(f, tag: bytes, block_size: int = 4 * 1024 * 1024):
+    """Splits an XML stream into blocks of complete `tag` elements
+
+    Each block consists of one or more consecutive top-level `tag` elements
+    (cut at the element's byte offsets), wrapped in a dummy root element so
+    that it can be parsed on its own.
+    """
+    start_regex = _re.compile(b"<" + tag + rb"[\s>]")
+    end_tag = b"</" + tag + b">"
+
+    buffer = b""
+    while True:
+        data = f.read(block_size)
+        buffer += data
+
+        start = start_regex.search(buffer)
+        end = buffer.rfind(end_tag)
+        if start is not None and end > start.start():
+            end += len(end_tag)
+            yield b"<root>" + buffer[start.start() : end] + b"</root>"
+            buffer = buffer[end:]
+        elif start is None:
+            # NOTE: Only the part of a start tag that may continue in the next
+            #       block is kept, rather than everything before the first one.
+            buffer = buffer[-len(tag) - 1 :]
+
+        if not data:
+            break
+
+
+def _bounded_imap(pool, func, iterable, max_pending: int):
+    """Ordered equivalent of `pool.imap` that keeps at most `max_pending` tasks in flight
+
+    `Pool.imap` consumes its input eagerly, which would buffer the whole
+    (decompressed) input file in memory if the workers fall behind.
+    """
+    pending = _deque()
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+
+    while pending:
+        yield pending.popleft().get()
+
+
+class _JSONStream:
+    """Minimal incremental JSON reader over a text stream
+
+    Values are decoded one at a time with `json.JSONDecoder.raw_decode`, reading
+    more of the stream only when a value is incomplete, so that only the value
+    currently being decoded is held in memory.
+    """
+
+    _WHITESPACE = " \t\n\r"
+    _NUMBER_CHARS = "0123456789+-.eE"
+    _BRACKET_DELTAS = {"[": 1, "{": 1, "]": -1, "}": -1}
+    _NON_BRACKET_REGEX = _re.compile(r"[^\[\]{}]+")
+
+    def __init__(self, f, block_size: int = 1024 * 1024):
+        self._f = f
+        self._block_size = block_size
+        self._decoder = _json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        data = self._f.read(self._block_size)
+        if not data:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self._WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} in JSON stream, found {found!r}")
+        self._pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except _json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A (top-level) number at the end of the buffer may have been cut short.
+            if isinstance(obj, (int, float)) and not isinstance(obj, bool):
+                tail = end
+                while tail < len(self._buffer) and self._buffer[tail] in self._NUMBER_CHARS:
+                    tail += 1
+                if tail == len(self._buffer) and not self._eof and self._fill():
+                    continue
+
+            self._pos = end
+            return obj
+
+    def skip(self) -> None:
+        """Skips a value without decoding it
+
+        Arrays and objects are scanned a block at a time (masking escapes and
+        splitting strings off at their quotes) for the bracket that closes them.
+        """
+        if self.peek() not in ("[", "{"):
+            self.value()
+            return
+
+        depth = 0
+        while True:
+            text = self._buffer[self._pos :].replace("\\\\", "__").replace('\\"', "__")
+            # Even parts are outside of strings, odd parts inside.
+            parts = text.split('"')
+            if len(parts) % 2 == 0:
+                # A string continues into the next block.
+                parts.pop()
+
+            brackets = self._NON_BRACKET_REGEX.sub("", "".join(parts[0::2]))
+            depths = _accumulate(map(self._BRACKET_DELTAS.__getitem__, brackets), initial=depth)
+            try:
+                n = _indexOf(_islice(depths, 1, None), 0)
+            except ValueError:
+                depth += sum(map(self._BRACKET_DELTAS.__getitem__, brackets))
+                self._pos += len('"'.join(parts))
+                if not self._fill():
+                    raise ValueError("unexpected end of JSON stream")
+                continue
+
+            # The value ends at the n-th bracket (outside of strings).
+            offset = self._pos
+            for i, part in enumerate(parts):
+                count = len(self._NON_BRACKET_REGEX.sub("", part)) if i % 2 == 0 else 0
+                if n < count:
+                    ends = [j for j, char in enumerate(part) if char in self._BRACKET_DELTAS]
+                    self._pos = offset + ends[n] + 1
+                    return
+                n -= count
+                offset += len(part) + 1
+            raise AssertionError("unreachable")
+
+    def iter_object_keys(self):
+        """Yields the keys of an object; the caller must consume each value before continuing"""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+
+            if self.peek() == ",":
+                self._pos += 1
+            else:
+                self.expect("}")
+                return
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.value()
+
+            if self.peek() == ",":
+                self._pos += 1
+            else:
+                self.expect("]")
+                return
+
+
+def _iter_obo_graph_json(path, keys=("nodes", "edges"), block_size: int = 1024 * 1024):
+    """Streams (key, item) pairs from the `keys` arrays of the first graph in an OBO graph JSON file
+
+    Items are yielded in file order; other members of the first graph are
+    skipped, and reading stops once all `keys` have been read.
+    """
+    remaining = set(keys)
+
+    with open(path, "r") as f:
+        stream = _JSONStream(f, block_size)
+
+        for key in stream.iter_object_keys():
+            if key != "graphs":
+                stream.skip()
+                continue
+
+            stream.expect("[")
+            for graph_key in stream.iter_object_keys():
+                if graph_key not in keys:
+                    stream.skip()
+                    continue
+
+                for item in stream.iter_array():
+                    yield graph_key, item
+
+                remaining.discard(graph_key)
+                if not remaining:
+                    return
+            return
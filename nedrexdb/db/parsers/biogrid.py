@@ -1,64 +1,50 @@
-from csv import DictReader as _DictReader
-from itertools import chain as _chain, product as _product
+from functools import partial as _partial
+from itertools import product as _product
+from multiprocessing import Pool as _Pool
 
 from more_itertools import chunked as _chunked
 from tqdm import tqdm as _tqdm
 
 from nedrexdb.db import MongoInstance
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import (
+    _bounded_imap,
+    _get_file_location_factory,
+    _get_worker_count,
+    _iter_line_blocks,
+)
 from nedrexdb.db.models.nodes.protein import Protein
 from nedrexdb.db.models.edges.protein_interacts_with_protein import ProteinInteractsWithProtein
 
 get_file_location = _get_file_location_factory("biogrid")
 
 
-class BioGridRow:
-    def __init__(self, row):
-        self._row = row
+def _parse_biogrid_lines(columns: tuple[int, ...], block: bytes) -> dict[tuple[str, str], set[str]]:
+    # NOTE: This function runs in worker processes, and maps each (sorted)
+    #       pair of UniProt accessions to the experimental systems it was
+    #       found with. Only the columns up to the last one needed are split.
+    system, *accession_columns = columns
+    a_columns, b_columns = accession_columns[:2], accession_columns[2:]
+    maxsplit = max(columns) + 1
 
-    def interactor_a_ids(self, proteins_allowed=None):
+    def accessions(fields, cols):
         accs = []
-        for db in ["SWISS-PROT", "TREMBL"]:
-            if self._row[f"{db} Accessions Interactor A"] != "-":
-                accs += self._row[f"{db} Accessions Interactor A"].split("|")
+        for i in cols:
+            if fields[i] != b"-":
+                accs += fields[i].decode("utf-8").split("|")
+        return [f"uniprot.{acc}" for acc in accs]
 
-        accs = [f"uniprot.{acc}" for acc in accs]
-        if proteins_allowed:
-            accs = [acc for acc in accs if acc in proteins_allowed]
+    pairs: dict[tuple[str, str], set[str]] = {}
+    for line in block.splitlines():
+        if not line or line.startswith(b"#"):
+            continue
 
-        return accs
+        fields = line.split(b"\t", maxsplit)
+        method = fields[system].decode("utf-8")
+        for a, b in _product(accessions(fields, a_columns), accessions(fields, b_columns)):
+            pair = (a, b) if a <= b else (b, a)
+            pairs.setdefault(pair, set()).add(method)
 
-    def interactor_b_ids(self, proteins_allowed=None):
-        accs = []
-        for db in ["SWISS-PROT", "TREMBL"]:
-            if self._row[f"{db} Accessions Interactor B"] != "-":
-                accs += self._row[f"{db} Accessions Interactor B"].split("|")
-
-        accs = [f"uniprot.{acc}" for acc in accs]
-        if proteins_allowed:
-            accs = [acc for acc in accs if acc in proteins_allowed]
-
-        return accs
-
-    @property
-    def methods(self):
-        return self._row["Experimental System"]
-
-    def parse(self, proteins_allowed=None):
-        ppis = []
-
-        for a, b in _product(self.interactor_a_ids(proteins_allowed), self.interactor_b_ids(proteins_allowed)):
-            a, b = sorted([a, b])
-            ppi = ProteinInteractsWithProtein(
-                memberOne=a,
-                memberTwo=b,
-                dataSources=["biogrid"],
-                evidenceTypes=["exp"],
-                methods=[self.methods],
-            )
-            ppis.append(ppi)
-
-        return ppis
+    return pairs
 
 
 class BioGridParser:
@@ -105,17 +91,47 @@ class BioGridParser:
     def __init__(self, f):
         self._f = f
 
-    def parse(self):
-        proteins = {i["primaryDomainId"] for i in Protein.find(MongoInstance.DB)}
+    def iter_interactions(self):
+        """Yields unique (memberOne, memberTwo, methods) interactions, parsing the file in parallel blocks"""
+        columns = tuple(
+            self.fieldnames.index(name)
+            for name in (
+                "Experimental System",
+                "SWISS-PROT Accessions Interactor A",
+                "TREMBL Accessions Interactor A",
+                "SWISS-PROT Accessions Interactor B",
+                "TREMBL Accessions Interactor B",
+            )
+        )
+        workers = _get_worker_count()
+        interactions: dict[tuple[str, str], set[str]] = {}
+
+        with open(self._f, "rb") as f, _Pool(workers) as pool:
+            func = _partial(_parse_biogrid_lines, columns)
+            for pairs in _bounded_imap(pool, func, _iter_line_blocks(f), max_pending=2 * workers):
+                for pair, methods in pairs.items():
+                    interactions.setdefault(pair, set()).update(methods)
+
+        for (a, b), methods in interactions.items():
+            yield a, b, sorted(methods)
 
-        with open(self._f, "r") as f:
-            reader = _DictReader(f, fieldnames=self.fieldnames, delimiter="\t")
-            members = (BioGridRow(row).parse(proteins_allowed=proteins) for row in reader)
+    def parse(self):
+        proteins = {i["primaryDomainId"] for i in Protein.find(MongoInstance.DB, projection={"primaryDomainId": 1})}
 
-            for chunk in _tqdm(_chunked(members, 1_000), leave=False, desc="Parsing BioGRID"):
-                updates = [ppi.generate_update() for ppi in _chain(*chunk)]
-                if updates:
-                    MongoInstance.DB[ProteinInteractsWithProtein.collection_name].bulk_write(updates)
+        updates = (
+            ProteinInteractsWithProtein(
+                memberOne=a,
+                memberTwo=b,
+                dataSources=["biogrid"],
+                evidenceTypes=["exp"],
+                methods=methods,
+            ).generate_update()
+            for a, b, methods in self.iter_interactions()
+            if a in proteins and b in proteins
+        )
+
+        for chunk in _tqdm(_chunked(updates, 1_000), leave=False, desc="Parsing BioGRID"):
+            MongoInstance.DB[ProteinInteractsWithProtein.collection_name].bulk_write(chunk)
 
 
 def parse_ppis():
@@ -1,10 +1,14 @@
 import gzip as _gzip
+import shutil as _shutil
 import sqlite3
 import subprocess as _sp
 
+from pymongo import UpdateOne as _UpdateOne
+
 from nedrexdb.db import MongoInstance
 from nedrexdb.db.parsers import _get_file_location_factory
 from nedrexdb.db.models.nodes.drug import Drug
+from nedrexdb.exceptions import ProcessError as _ProcessError
 
 get_file_location = _get_file_location_factory("chembl")
 
@@ -21,35 +25,71 @@ def get_chembl_drugbank_map():
     return cd_map
 
 
+def _file_stamp(path) -> str:
+    stat = path.stat()
+    return f"{stat.st_size} {stat.st_mtime_ns}"
+
+
 def decompress_if_necessary():
     path = get_file_location("sqlite")
     target = path.parents[0] / path.name.rsplit(".", 2)[0]
+    # NOTE: The size and modification time of the tarball that was extracted
+    #       are stored alongside the extracted files, so that a changed download
+    #       is re-extracted (without reading the whole tarball to hash it).
+    stamp_file = target / ".source"
+
+    stamp = _file_stamp(path)
     if target.exists():
-        return target
+        if stamp_file.exists() and stamp_file.read_text().strip() == stamp:
+            return target
+        _shutil.rmtree(target)
 
     target.mkdir(parents=True)
-    _sp.call(
+    returncode = _sp.call(
         ["tar", "-zxvf", f"{path}", "-C", f"{target.resolve()}", "--strip-components", "1"], cwd=f"{path.parents[0]}"
     )
+    if returncode != 0:
+        raise _ProcessError(f"failed to extract {path}")
+    stamp_file.write_text(stamp)
 
     return target
 
 
+def get_approved_drugs(con, cd_map: dict[str, str]) -> list[str]:
+    """Returns the DrugBank IDs (in cd_map) whose mapped ChEMBL molecule has a max phase of 4"""
+    cur = con.cursor()
+    cur.execute("CREATE TEMP TABLE unichem_map (drugbank_id TEXT PRIMARY KEY, chembl_id TEXT)")
+    cur.executemany("INSERT INTO unichem_map VALUES (?, ?)", cd_map.items())
+
+    query = """
+        SELECT u.drugbank_id
+        FROM unichem_map u
+        JOIN MOLECULE_DICTIONARY md ON md.CHEMBL_ID = u.chembl_id
+        GROUP BY u.drugbank_id
+        HAVING MAX(md.MAX_PHASE) = 4
+    """
+    approved = [drugbank_id for (drugbank_id,) in cur.execute(query)]
+
+    cur.execute("DROP TABLE unichem_map")
+    return approved
+
+
 def parse_chembl():
     cd_map = get_chembl_drugbank_map()
 
     path = decompress_if_necessary()
     db = [i for i in path.rglob("*") if i.name.endswith(".db")][0]
     con = sqlite3.connect(f"{db}")
-    cur = con.cursor()
 
-    for drugbank_id, chembl_id in cd_map.items():
-        result = list(cur.execute("SELECT MAX_PHASE FROM MOLECULE_DICTIONARY WHERE CHEMBL_ID = '%s'" % chembl_id))
-        if not result:
-            continue
-        max_phase = max(i[0] for i in result)
+    approved = get_approved_drugs(con, cd_map)
+    con.close()
 
-        if max_phase == 4:
-            query = {"primaryDomainId": f"drugbank.{drugbank_id}"}
-            update = {"$addToSet": {"drugGroups": "approved", "dataSources": "chembl"}}
-            MongoInstance.DB[Drug.collection_name].update_one(query, update)
+    updates = [
+        _UpdateOne(
+            {"primaryDomainId": f"drugbank.{drugbank_id}"},
+            {"$addToSet": {"drugGroups": "approved", "dataSources": "chembl"}},
+        )
+        for drugbank_id in approved
+    ]
+    if updates:
+        MongoInstance.DB[Drug.collection_name].bulk_write(updates)
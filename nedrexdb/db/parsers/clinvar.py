@@ -1,10 +1,12 @@
 import gzip as _gzip
-import xml.etree.cElementTree as _et
 from collections import defaultdict as _defaultdict
 from csv import DictReader as _DictReader
 from functools import lru_cache as _lru_cache
+from io import BytesIO as _BytesIO
 from itertools import chain as _chain
+from multiprocessing import Pool as _Pool
 
+from lxml import etree as _etree
 from more_itertools import chunked as _chunked
 from tqdm import tqdm as _tqdm
 
@@ -14,7 +16,13 @@ from nedrexdb.db.models.edges.variant_associated_with_disorder import VariantAss
 from nedrexdb.db.models.nodes.disorder import Disorder
 from nedrexdb.db.models.nodes.gene import Gene
 from nedrexdb.db.models.nodes.genomic_variant import GenomicVariant
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import (
+    _bounded_imap,
+    _get_file_location_factory,
+    _get_worker_count,
+    _gunzip_stream,
+    _iter_xml_blocks,
+)
 from nedrexdb.logger import logger
 
 get_file_location = _get_file_location_factory("clinvar")
@@ -60,6 +68,49 @@ def get_variant_by_primary_domain_id(pdid: str):
     return GenomicVariant.find_one(MongoInstance.DB, query)
 
 
+# Variant IDs in NeDRexDB, set in each worker process by _set_variant_ids
+_variant_ids: set[str] = set()
+
+
+def _set_variant_ids(variant_ids: set[str]) -> None:
+    global _variant_ids
+    _variant_ids = variant_ids
+
+
+def _parse_clinvar_sets(block: bytes) -> list[tuple]:
+    # NOTE: This function runs in worker processes, and returns plain tuples
+    #       (rather than models) to keep the cost of sending results back low.
+    #       Only sets for variants in NeDRexDB are read beyond their ID.
+    records = []
+
+    for _, elem in _etree.iterparse(_BytesIO(block), events=("end",), tag="ClinVarSet"):
+        rcva = elem.find("ReferenceClinVarAssertion")
+        ms = rcva.find("MeasureSet")
+
+        if ms is not None and f"clinvar.{ms.get('ID')}" in _variant_ids:
+            xrefs = [
+                (xref.get("ID"), xref.get("DB"))
+                for trait in rcva.find("TraitSet").iterfind("Trait")
+                if trait.get("Type") == "Disease"
+                for xref in trait.iterfind("XRef")
+            ]
+
+            significance = rcva.find("ClinicalSignificance")
+            effects = [effect.strip() for effect in significance.findtext("Description").split(",")]
+            review_status = significance.findtext("ReviewStatus")
+            acc = rcva.find("ClinVarAccession").get("Acc")
+
+            records.append((f"clinvar.{ms.get('ID')}", xrefs, effects, review_status, acc))
+
+        # Clear the element, and delete previous siblings so that the (dummy)
+        # root does not keep references to cleared elements.
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    return records
+
+
 class ClinVarXMLParser:
     def __init__(self, fname):
         self.fname = fname
@@ -70,72 +121,37 @@ class ClinVarXMLParser:
 
         assert None not in variant_ids
 
-        with _gzip.open(self.fname, "rt") as f:
-            for _, elem in _et.iterparse(f, events=("end",)):
-                if elem.tag == "ReferenceClinVarAssertion":
-                    pass
-
-                elif elem.tag == "ClinVarSet":
-                    ms = elem.find("ReferenceClinVarAssertion").find("MeasureSet")
-                    if ms:
-                        variant_pdid = f"clinvar.{ms.attrib['ID']}"
-                    else:
-                        variant_pdid = None
-
-                    if ms and variant_pdid in variant_ids:
-                        traits = elem.find("ReferenceClinVarAssertion").find("TraitSet").findall("Trait")
-                        traits = _chain(
-                            *[
-                                [xref.attrib for xref in trait.findall("XRef")]
-                                for trait in traits
-                                if trait.attrib["Type"] == "Disease"
-                            ]
-                        )
-                        traits = {xml_disorder_mapper(item["ID"], item["DB"]) for item in traits}
-                        traits = set(
-                            _chain(*[disorder_domain_id_map.get(domain_id, []) for domain_id in traits if domain_id])
+        workers = _get_worker_count()
+
+        # NOTE: Decompression runs in a separate (gzip) process, and the XML is
+        #       split into blocks of ClinVarSet elements that are parsed by a
+        #       pool of worker processes.
+        # NOTE: The variant IDs are sent to each worker once, when the pool
+        #       starts, rather than with every block.
+        with _gunzip_stream(self.fname) as f, _Pool(
+            workers, initializer=_set_variant_ids, initargs=(variant_ids,)
+        ) as pool:
+            blocks = _iter_xml_blocks(f, b"ClinVarSet")
+
+            for records in _bounded_imap(pool, _parse_clinvar_sets, blocks, max_pending=2 * workers):
+                for variant_pdid, xrefs, effects, review_status, acc in records:
+                    traits = {xml_disorder_mapper(xref_id, xref_db) for xref_id, xref_db in xrefs}
+                    traits = set(
+                        _chain(*[disorder_domain_id_map.get(domain_id, []) for domain_id in traits if domain_id])
+                    )
+                    traits.discard(None)
+
+                    for trait in traits:
+                        vawd = VariantAssociatedWithDisorder(
+                            sourceDomainId=variant_pdid,
+                            targetDomainId=trait,
+                            accession=acc,
+                            effects=effects,
+                            reviewStatus=review_status,
+                            dataSources=["clinvar"],
                         )
-                        traits.discard(None)
-
-                        effects = [
-                            effect.strip()
-                            for effect in elem.find("ReferenceClinVarAssertion")
-                            .find("ClinicalSignificance")
-                            .find("Description")
-                            .text.split(",")
-                        ]
-                        review_status = (
-                            elem.find("ReferenceClinVarAssertion")
-                            .find("ClinicalSignificance")
-                            .find("ReviewStatus")
-                            .text
-                        )
-                        acc = elem.find("ReferenceClinVarAssertion").find("ClinVarAccession").attrib["Acc"]
-
-                        for trait in traits:
-                            vawd = VariantAssociatedWithDisorder(
-                                sourceDomainId=variant_pdid,
-                                targetDomainId=trait,
-                                accession=acc,
-                                effects=effects,
-                                reviewStatus=review_status,
-                                dataSources=["clinvar"],
-                            )
-
-                            yield vawd
-
-                    elem.clear()
-
-                elif elem.tag == "MeasureSet":
-                    pass
-                elif elem.tag == "ClinVarAccession":
-                    pass
-                elif elem.tag in {"ClinicalSignificance", "Description", "ReviewStatus"}:
-                    pass
-                elif elem.tag in {"TraitSet", "Trait", "XRef"}:
-                    pass
-                else:
-                    elem.clear()
+
+                        yield vawd
 
 
 class ClinVarVCFParser:
@@ -1,52 +1,35 @@
+import csv as _csv
 from collections import defaultdict as _defaultdict
-from csv import DictReader as _DictReader
-from typing import Optional as _Optional
-from itertools import product as _product, chain as _chain
-import gzip as _gzip
 
+import pandas as _pd
 from more_itertools import chunked as _chunked
 
 from nedrexdb.db import MongoInstance
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import _get_file_location_factory, _iter_tsv_chunks
 from nedrexdb.db.models.nodes.disorder import Disorder
 from nedrexdb.db.models.nodes.drug import Drug
 from nedrexdb.db.models.edges.drug_has_indication import DrugHasIndication
 
 get_file_location = _get_file_location_factory("ctd")
 
-
-class CTDDrugChemicalRow:
-    def __init__(self, row):
-        self._row = row
-
-    def drug_ids(self, casn_map: dict[str, list[str]]) -> _Optional[list[str]]:
-        drug_id = self._row["CasRN"]
-        if drug_id:
-            return casn_map.get(drug_id, [])
-        else:
-            return []
-
-    def disorder_ids(self, mn_map: dict[str, list[str]]) -> _Optional[list[str]]:
-        disease_id = self._row["DiseaseID"]
-        if disease_id:
-            return mn_map.get(disease_id.replace("MESH:", "mesh."), [])
-        else:
-            return []
-
-    def parse(self, casn_map, mn_map):
-        indications = []
-
-        for drug, disorder in _product(self.drug_ids(casn_map), self.disorder_ids(mn_map)):
-            dhi = DrugHasIndication(sourceDomainId=drug, targetDomainId=disorder, dataSources=["ctd"])
-            indications.append(dhi)
-
-        return indications
+_FIELDNAMES = (
+    "ChemicalName",
+    "ChemicalID",
+    "CasRN",
+    "DiseaseName",
+    "DiseaseID",
+    "DirectEvidence",
+    "InferenceGeneSymbol",
+    "InferenceScore",
+    "OmimIDs",
+    "PubMedIDs",
+)
 
 
 def mesh_to_nedrex_map() -> dict[str, list[str]]:
     mn_map = _defaultdict(list)
 
-    for doc in Disorder.find(MongoInstance.DB):
+    for doc in Disorder.find(MongoInstance.DB, projection={"domainIds": 1, "primaryDomainId": 1}):
         mesh_ids = [mid for mid in doc["domainIds"] if mid.startswith("mesh.")]
         for mid in mesh_ids:
             mn_map[mid].append(doc["primaryDomainId"])
@@ -57,35 +40,54 @@ def mesh_to_nedrex_map() -> dict[str, list[str]]:
 def cas_rn_to_nedrex_map() -> dict[str, list[str]]:
     casn_map = _defaultdict(list)
 
-    for doc in Drug.find(MongoInstance.DB):
+    for doc in Drug.find(MongoInstance.DB, projection={"casNumber": 1, "primaryDomainId": 1}):
         casn_map[doc["casNumber"]].append(doc["primaryDomainId"])
 
     return casn_map
 
 
+def iter_chemical_disease_chunks(fname, chunksize: int = 500_000):
+    # NOTE: Only the columns needed for drug indications are read; the header
+    #       comments have no direct evidence, and so are dropped with the
+    #       inferred associations.
+    return _iter_tsv_chunks(
+        fname,
+        chunksize,
+        header=None,
+        names=_FIELDNAMES,
+        usecols=["CasRN", "DiseaseID", "DirectEvidence"],
+        quoting=_csv.QUOTE_NONE,
+        compression="gzip",
+    )
+
+
+def map_indications(chunk, casn_map: dict[str, list[str]], mn_map: dict[str, list[str]]):
+    """Maps the therapeutic rows of a chunk to unique (drug, disorder) pairs"""
+    chunk = chunk[(chunk["DirectEvidence"] == "therapeutic") & (chunk["CasRN"] != "") & (chunk["DiseaseID"] != "")]
+
+    df = _pd.DataFrame(
+        {
+            "drug": chunk["CasRN"].map(casn_map),
+            "disorder": chunk["DiseaseID"].str.replace("MESH:", "mesh.", regex=False).map(mn_map),
+        }
+    )
+    df = df.dropna().explode("drug").explode("disorder").dropna()
+    return df.drop_duplicates()
+
+
 def parse():
-    fieldnames = [
-        "ChemicalName",
-        "ChemicalID",
-        "CasRN",
-        "DiseaseName",
-        "DiseaseID",
-        "DirectEvidence",
-        "InferenceGeneSymbol",
-        "InferenceScore",
-        "OmimIDs",
-        "PubMedIDs",
-    ]
     fname = get_file_location("chemical_disease_relationships")
-    casn_map = cas_rn_to_nedrex_map()
-    mn_map = mesh_to_nedrex_map()
-
-    with _gzip.open(fname, "rt") as f:
-        reader = _DictReader(f, delimiter="\t", fieldnames=fieldnames)
-        updates = (
-            CTDDrugChemicalRow(row).parse(casn_map, mn_map) for row in reader if row["DirectEvidence"] == "therapeutic"
-        )
-
-        for chunk in _chunked(updates, 1_000):
-            chunk = [i.generate_update() for i in _chain(*chunk)]
-            MongoInstance.DB[DrugHasIndication.collection_name].bulk_write(chunk)
+    casn_map = dict(cas_rn_to_nedrex_map())
+    mn_map = dict(mesh_to_nedrex_map())
+
+    pairs = set()
+    for chunk in iter_chemical_disease_chunks(fname):
+        df = map_indications(chunk, casn_map, mn_map)
+        pairs.update(zip(df["drug"], df["disorder"]))
+
+    updates = (
+        DrugHasIndication(sourceDomainId=drug, targetDomainId=disorder, dataSources=["ctd"]).generate_update()
+        for drug, disorder in pairs
+    )
+    for chunk in _chunked(updates, 1_000):
+        MongoInstance.DB[DrugHasIndication.collection_name].bulk_write(chunk)
@@ -1,9 +1,7 @@
-import gzip as _gzip
 from collections import defaultdict as _defaultdict
-from csv import DictReader as _DictReader
-from itertools import chain as _chain
 from pathlib import Path as _Path
 
+import pandas as _pd
 from more_itertools import chunked as _chunked
 from tqdm import tqdm as _tqdm
 
@@ -11,7 +9,7 @@ from nedrexdb.db import MongoInstance
 from nedrexdb.db.models.nodes.disorder import Disorder
 from nedrexdb.db.models.nodes.gene import Gene
 from nedrexdb.db.models.edges.gene_associated_with_disorder import GeneAssociatedWithDisorder
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import _get_file_location_factory, _iter_tsv_chunks
 
 get_file_location = _get_file_location_factory("disgenet")
 
@@ -19,7 +17,7 @@ get_file_location = _get_file_location_factory("disgenet")
 def _umls_to_nedrex_map() -> dict[str, list[str]]:
     d = _defaultdict(list)
 
-    for dis in Disorder.find(MongoInstance.DB):
+    for dis in Disorder.find(MongoInstance.DB, projection={"domainIds": 1, "primaryDomainId": 1}):
         umls_ids = [acc for acc in dis["domainIds"] if acc.startswith("umls.")]
         for umls_id in umls_ids:
             d[umls_id].append(dis["primaryDomainId"])
@@ -27,67 +25,50 @@ def _umls_to_nedrex_map() -> dict[str, list[str]]:
     return d
 
 
-class DisGeNetRow:
-    def __init__(self, row):
-        self._row = row
+def collapse_associations(chunk, genes: set[str], umls_nedrex_map: dict[str, list[str]]):
+    """Filters a chunk of DisGeNET rows to known genes and mapped disorders, taking the max score per pair"""
+    gene_ids = "entrez." + chunk["geneId"].str.strip()
+    disorder_ids = ("umls." + chunk["diseaseId"].str.strip()).map(umls_nedrex_map)
+    mask = gene_ids.isin(genes) & disorder_ids.notna()
 
-    def get_gene_id(self):
-        return f"entrez.{self._row['geneId'].strip()}"
-
-    def get_disorder_id(self):
-        return f"umls.{self._row['diseaseId'].strip()}"
-
-    def get_score(self) -> float:
-        return float(self._row["score"])
-
-    def parse(self, umls_nedrex_map: dict[str, list[str]]) -> list[GeneAssociatedWithDisorder]:
-        sourceDomainId = self.get_gene_id()
-        score = self.get_score()
-        asserted_by = ["disgenet"]
-        disorders = umls_nedrex_map.get(self.get_disorder_id(), [])
-
-        gawds = [
-            GeneAssociatedWithDisorder(
-                sourceDomainId=sourceDomainId, targetDomainId=disorder, score=score, dataSources=asserted_by
-            )
-            for disorder in disorders
-        ]
-
-        return gawds
+    df = _pd.DataFrame({"gene": gene_ids[mask], "disorder": disorder_ids[mask], "score": chunk["score"][mask]})
+    df = df.explode("disorder")
+    return df.groupby(["gene", "disorder"], sort=False)["score"].max()
 
 
 class DisGeNetParser:
     def __init__(self, f: _Path):
         self.f = f
 
-        if self.f.name.endswith(".gz") or self.f.name.endswith(".gzip"):
-            self.gzipped = True
-        else:
-            self.gzipped = False
+    def iter_chunks(self, chunksize: int = 500_000):
+        return _iter_tsv_chunks(
+            self.f,
+            chunksize,
+            usecols=["geneId", "diseaseId", "score"],
+            dtype={"geneId": str, "diseaseId": str, "score": float},
+        )
 
     def parse(self):
-        if self.gzipped:
-            f = _gzip.open(self.f, "rt")
-        else:
-            f = self.f.open()
-
-        reader = _DictReader(f, delimiter="\t")
-
-        umls_nedrex_map = _umls_to_nedrex_map()
-        genes = {gene["primaryDomainId"] for gene in Gene.find(MongoInstance.DB)}
-
-        updates = (DisGeNetRow(row).parse(umls_nedrex_map) for row in reader)
+        umls_nedrex_map = dict(_umls_to_nedrex_map())
+        genes = {gene["primaryDomainId"] for gene in Gene.find(MongoInstance.DB, projection={"primaryDomainId": 1})}
+
+        # NOTE: A (gene, disorder) pair can be reached through several UMLS IDs;
+        #       such pairs are collapsed to one association with the max score.
+        scores: dict[tuple[str, str], float] = {}
+        for chunk in _tqdm(self.iter_chunks(), leave=False, desc="Reading DisGeNET"):
+            for pair, score in collapse_associations(chunk, genes, umls_nedrex_map).items():
+                if score > scores.get(pair, float("-inf")):
+                    scores[pair] = score
+
+        updates = (
+            GeneAssociatedWithDisorder(
+                sourceDomainId=gene, targetDomainId=disorder, score=score, dataSources=["disgenet"]
+            ).generate_update()
+            for (gene, disorder), score in scores.items()
+        )
         for chunk in _tqdm(_chunked(updates, 1_000), leave=False, desc="Parsing DisGeNET"):
-            chunk = list(_chain(*chunk))
-            chunk = [gawd.generate_update() for gawd in chunk if gawd.sourceDomainId in genes]
-
-            if not chunk:
-                continue
-
             MongoInstance.DB[GeneAssociatedWithDisorder.collection_name].bulk_write(chunk)
 
-        f.close()
-
 
 def parse_gene_disease_associations():
     fname = get_file_location("gene_disease_associations")
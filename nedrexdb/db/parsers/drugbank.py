@@ -1,5 +1,3 @@
-import xml.etree.cElementTree as _et
-from collections import OrderedDict as _OrderedDict
 from csv import DictReader as _DictReader
 from itertools import chain
 from multiprocessing import Pool as _Pool
@@ -7,12 +5,12 @@ from typing import Optional as _Optional
 from uuid import uuid4 as _uuid4
 from zipfile import ZipFile as _ZipFile
 
+from lxml import etree as _etree
 from more_itertools import chunked as _chunked
 from tqdm import tqdm as _tqdm
-from xmljson import badgerfish as _bf
 
 from nedrexdb.db import MongoInstance
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import _bounded_imap, _get_file_location_factory, _get_worker_count
 from nedrexdb.db.models.nodes.drug import Drug, BiotechDrug, SmallMoleculeDrug
 from nedrexdb.db.models.nodes.protein import Protein
 from nedrexdb.db.models.edges.drug_has_target import DrugHasTarget
@@ -21,12 +19,16 @@ from nedrexdb.exceptions import AssumptionError as _AssumptionError
 get_file_location = _get_file_location_factory("drugbank")
 
 
-def _recursive_yield(elem):
-    if isinstance(elem, _OrderedDict):
-        yield elem
-    else:
-        for i in elem:
-            yield from _recursive_yield(i)
+_NAMESPACES = {"db": "http://www.drugbank.ca"}
+
+
+# ns = namespace
+def ns(string) -> str:
+    return "{http://www.drugbank.ca}" + string
+
+
+def _texts(elem, path) -> list[str]:
+    return [child.text for child in elem.iterfind(path, namespaces=_NAMESPACES) if child.text]
 
 
 class DrugBankDrugTarget:
@@ -34,30 +36,14 @@ class DrugBankDrugTarget:
         self._entry = entry
 
     def iter_targets(self):
-        targets = self._entry.get(ns("targets"))
-        if not targets:
-            return []
-
-        targets = targets.get(ns("target"))
-        if not targets:
-            return []
-
-        for target in _recursive_yield(targets):
-            actions = target.get(ns("actions"))
-            if actions:
-                actions = [i["$"] for i in _recursive_yield(actions[ns("action")])]
-            else:
-                actions = []
-
-            polypeptide = target.get(ns("polypeptide"))
-            if not polypeptide:
-                continue
-
-            for item in _recursive_yield(polypeptide):
-                if not item["@source"] in {"TrEMBL", "Swiss-Prot"}:
+        for target in self._entry.iterfind("db:targets/db:target", namespaces=_NAMESPACES):
+            actions = _texts(target, "db:actions/db:action")
+
+            for polypeptide in target.iterfind(ns("polypeptide")):
+                if not polypeptide.get("source") in {"TrEMBL", "Swiss-Prot"}:
                     continue
 
-                yield (f"uniprot.{item['@id']}", actions)
+                yield (f"uniprot.{polypeptide.get('id')}", actions)
 
     def get_drug(self):
         return DrugBankEntry(self._entry).get_primary_domain_id()
@@ -91,19 +77,17 @@ class DrugBankEntry:
         if self.__calculated_properties is not None:
             return self.__calculated_properties
 
-        properties = self._entry[ns("calculated-properties")]
-        if ns("property") not in properties.keys():
-            self.__calculated_properties = {}
-            return self.__calculated_properties
-
-        properties = properties[ns("property")]
-        if isinstance(properties, _OrderedDict):
-            properties = [properties]
-        self.__calculated_properties = {prop[ns("kind")]["$"]: prop[ns("value")]["$"] for prop in properties}
+        self.__calculated_properties = {
+            prop.findtext(ns("kind")): prop.findtext(ns("value"))
+            for prop in self._entry.iterfind("db:calculated-properties/db:property", namespaces=_NAMESPACES)
+        }
         return self.__calculated_properties
 
+    def _text(self, tag) -> str:
+        return self._entry.findtext(ns(tag)) or ""
+
     def get_drug_type(self) -> str:
-        drug_type = self._entry["@type"]
+        drug_type = self._entry.get("type")
 
         if drug_type == "biotech":
             return "BiotechDrug"
@@ -113,91 +97,35 @@ class DrugBankEntry:
             raise _AssumptionError("encountered unexpected DrugBank drug type")
 
     def get_primary_domain_id(self) -> str:
-        drug_ids = self._entry[ns("drugbank-id")]
-        if isinstance(drug_ids, _OrderedDict):
-            drug_ids = [drug_ids]
-
-        primary_ids = [drug_id for drug_id in drug_ids if "@primary" in drug_id]
+        primary_ids = [drug_id.text for drug_id in self._entry.iterfind(ns("drugbank-id")) if drug_id.get("primary")]
         if len(primary_ids) != 1:
             raise _AssumptionError("expected only one primary ID for DrugBank drug")
 
-        return f"drugbank.{primary_ids.pop()['$']}"
+        return f"drugbank.{primary_ids.pop()}"
 
     def get_domain_ids(self) -> list[str]:
-        drug_ids = self._entry[ns("drugbank-id")]
-        if isinstance(drug_ids, _OrderedDict):
-            drug_ids = [drug_ids]
-
-        drug_ids = [f"drugbank.{drug_id['$']}" for drug_id in drug_ids]
-        return drug_ids
+        return [f"drugbank.{drug_id}" for drug_id in _texts(self._entry, "db:drugbank-id")]
 
     def get_display_name(self) -> str:
-        return self._entry[ns("name")]["$"]
+        return self._text("name")
 
     def get_indications(self) -> str:
-        indications = self._entry[ns("indication")]
-        if "$" in indications.keys():
-            return indications["$"]
-        else:
-            return ""
+        return self._text("indication")
 
     def get_cas_number(self) -> str:
-        cas_number = self._entry[ns("cas-number")]
-        if "$" in cas_number:
-            return cas_number["$"]
-        else:
-            return ""
+        return self._text("cas-number")
 
     def get_description(self) -> str:
-        description = self._entry[ns("description")]
-        if "$" in description:
-            return description["$"]
-        else:
-            return ""
+        return self._text("description")
 
     def get_synonyms(self) -> list[str]:
-        synonyms: list[str] = []
-
-        syns = self._entry[ns("synonyms")]
-        if not ns("synonym") in syns.keys():
-            return synonyms
-
-        syns = syns[ns("synonym")]
-        if isinstance(syns, _OrderedDict):
-            syns = [syns]
-        for synonym in syns:
-            synonyms.append(synonym["$"])
-
-        return synonyms
+        return _texts(self._entry, "db:synonyms/db:synonym")
 
     def get_drug_categories(self) -> list[str]:
-        categories: list[str] = []
-
-        cats = self._entry[ns("categories")]
-        if not ns("category") in cats:
-            return categories
-
-        cats = cats[ns("category")]
-        if isinstance(cats, _OrderedDict):
-            cats = [cats]
-        for cat in cats:
-            categories.append(cat[ns("category")]["$"])
-
-        return categories
+        return _texts(self._entry, "db:categories/db:category/db:category")
 
     def get_drug_groups(self) -> list[str]:
-        groups: list[str] = []
-
-        if ns("groups") not in self._entry.keys():
-            return groups
-
-        grps = self._entry[ns("groups")][ns("group")]
-        if isinstance(grps, _OrderedDict):
-            grps = [grps]
-        for grp in grps:
-            groups.append(grp["$"])
-
-        return groups
+        return _texts(self._entry, "db:groups/db:group")
 
     def get_smiles(self) -> _Optional[str]:
         return self._calculated_properties.get("SMILES")
@@ -212,18 +140,12 @@ class DrugBankEntry:
         return self._calculated_properties.get("Molecular Formula")
 
     def get_sequences(self) -> list[str]:
-        sequences: list[str] = []
-
-        seqs = self._entry[ns("sequences")]
-        if not ns("sequence") in seqs.keys():
-            return sequences
-
-        seqs = seqs[ns("sequence")]
-        if isinstance(seqs, _OrderedDict):
-            seqs = [seqs]
-
-        seqs = [seq for seq in seqs if seq["@format"] == "FASTA"]
-        seqs = [seq["$"].split("\n", 1) for seq in seqs]
+        seqs = [
+            seq.text
+            for seq in self._entry.iterfind("db:sequences/db:sequence", namespaces=_NAMESPACES)
+            if seq.get("format") == "FASTA" and seq.text
+        ]
+        seqs = [seq.split("\n", 1) for seq in seqs]
         seqs = [(name[1:], seq.replace("\n", "")) for name, seq in seqs]
         sequences = [">{} {}\n{}".format(_uuid4(), name, seq) for name, seq in seqs]
         return sequences
@@ -256,20 +178,20 @@ class DrugBankEntry:
         return d
 
 
-# ns = namespace
-def ns(string) -> str:
-    return "{http://www.drugbank.ca}" + string
-
-
-def _entry_to_update(entry):
+def _entry_to_update(entry: bytes):
     # NOTE: This function parses both drugs and drug targets, which means that
-    #       there is no need to iterate over the file a second time.
-    entry_as_json = _bf.data(entry)[ns("drug")]
-    db = DrugBankEntry(entry_as_json).parse().generate_update()
-    dht = [i.generate_update() for i in DrugBankDrugTarget(entry_as_json).parse()]
+    #       there is no need to iterate over the file a second time. It runs in
+    #       worker processes, and is given the serialized XML of a single drug.
+    elem = _etree.fromstring(entry)
+    db = DrugBankEntry(elem).parse().generate_update()
+    dht = [i.generate_update() for i in DrugBankDrugTarget(elem).parse()]
     return db, dht
 
 
+def _entries_to_updates(entries: list[bytes]):
+    return [_entry_to_update(entry) for entry in entries]
+
+
 def parse_drugbank_open():
     filename = get_file_location("open")
     zf = _ZipFile(filename)
@@ -292,30 +214,33 @@ def parse_drugbank():
         MongoInstance.DB[Drug.collection_name].bulk_write(chunk)
 
 
-def _parse_drugbank():
-    filename = get_file_location("all")
+def _iter_drugbank_entries(filename):
+    """Yields the serialized XML of each (top-level) drug in the DrugBank XML file"""
+    for _, elem in _etree.iterparse(f"{filename}", events=("end",), tag=ns("drug")):
+        # NOTE: <drug> elements are also nested within other elements (e.g.,
+        #       pathways); only drugs that are children of the root are entries.
+        parent = elem.getparent()
+        if parent is None or parent.getparent() is not None:
+            continue
 
-    def db_iter():
-        with open(filename, "r") as handle:
-            depth = 0
+        yield _etree.tostring(elem)
 
-            # Iterate through and yield drugs.
-            for event, elem in _et.iterparse(handle, events=["start", "end"]):
-                if elem.tag != ns("drug"):
-                    continue
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
 
-                if event == "start":
-                    depth += 1
-                elif event == "end":
-                    depth -= 1
 
-                if event == "end" and depth == 0:
-                    yield elem
+def _parse_drugbank(workers: _Optional[int] = None, chunksize: int = 10):
+    filename = get_file_location("all")
+
+    if workers is None:
+        workers = _get_worker_count()
 
     proteins = {protein["primaryDomainId"] for protein in Protein.find(MongoInstance.DB)}
 
-    with _Pool(2) as pool:
-        updates = pool.imap_unordered(_entry_to_update, db_iter(), chunksize=10)
+    with _Pool(workers) as pool:
+        entries = _chunked(_iter_drugbank_entries(filename), chunksize)
+        updates = chain.from_iterable(_bounded_imap(pool, _entries_to_updates, entries, max_pending=4 * workers))
         for chunk in _tqdm(_chunked(updates, 100), leave=False, desc="Parsing DrugBank"):
             chunk = [item for item in chunk if item]
             drugs, drug_targets = zip(*chunk)
@@ -1,14 +1,15 @@
+import csv as _csv
 import gzip as _gzip
-from collections import defaultdict as _defaultdict
-from csv import DictReader as _DictReader
-from itertools import chain as _chain
+import sys as _sys
+from itertools import takewhile as _takewhile
 
+import pandas as _pd
+from lxml import etree as _etree
 from more_itertools import chunked as _chunked
-from rdflib import Graph as _Graph, term as _term
 from tqdm import tqdm as _tqdm
 
 from nedrexdb.db import MongoInstance
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import _get_file_location_factory, _iter_tsv_chunks
 from nedrexdb.db.models.nodes.go import GO
 from nedrexdb.db.models.nodes.protein import Protein
 from nedrexdb.db.models.edges.go_is_subtype_of_go import GOIsSubtypeOfGO
@@ -18,103 +19,107 @@ from nedrexdb.logger import logger
 get_file_location = _get_file_location_factory("go")
 
 
-def iter_go_associations(f):
-    fieldnames = (
-        "DB",
-        "DB Object ID",
-        "DB Object Symbol",
-        "Qualifier",
-        "GO ID",
-        "DB:Reference (IDB:Reference)",
-        "Evidence Code",
-        "With (or) From",
-        "Aspect",
-        "DB Object Name",
-        "DB Object Synonym (ISynonym)",
-        "DB Object Type",
-        "Taxon(Itaxon)" "Date",
-        "Assigned By",
-        "Annotation Extension",
-        "Gene Product Form ID",
-    )
+# NOTE: Only the GAF columns used to build annotations are read.
+_GAF_COLUMNS = {0: "DB", 1: "DB Object ID", 3: "Qualifier", 4: "GO ID"}
+_GAF_FIELD_COUNT = 17
 
-    with _gzip.open(f, "rt") as f:
-        f = filter(lambda line: not line.startswith("!"), f)
-        reader = _DictReader(f, fieldnames=fieldnames, delimiter="\t")
-        for row in reader:
-            yield row
 
+def _count_header_lines(f) -> int:
+    with _gzip.open(f, "rt") as handle:
+        return sum(1 for _ in _takewhile(lambda line: line.startswith("!"), handle))
 
-class GOAssociation:
-    def __init__(self, row):
-        self._row = row
 
-    @property
-    def source_domain_id(self):
-        return f"uniprot.{self._row['DB Object ID']}"
+def iter_go_association_chunks(f, chunksize: int = 500_000):
+    """Reads the used columns of a (gzipped) GAF file into DataFrames of `chunksize` rows"""
+    reader = _iter_tsv_chunks(
+        f,
+        chunksize,
+        header=None,
+        names=range(_GAF_FIELD_COUNT),
+        usecols=list(_GAF_COLUMNS),
+        skiprows=_count_header_lines(f),
+        quoting=_csv.QUOTE_NONE,
+        compression="gzip",
+    )
 
-    @property
-    def target_domain_id(self):
-        return self._row["GO ID"].replace("GO:", "go.")
+    for chunk in reader:
+        yield chunk.rename(columns=_GAF_COLUMNS)
 
-    @property
-    def qualifiers(self):
-        return self._row["Qualifier"].split("|")
-
-    def parse(self):
-        return ProteinHasGOAnnotation(
-            sourceDomainId=self.source_domain_id,
-            targetDomainId=self.target_domain_id,
-            qualifiers=self.qualifiers,
-            dataSources=["go"],
-        )
 
+def group_go_associations(chunk, proteins, go_terms):
+    """Filters a chunk of GAF rows to known proteins and GO terms, and groups qualifiers per pair"""
+    chunk = chunk[chunk["DB"] == "UniProtKB"]
 
-class GORelations:
-    def __init__(self, po):
-        # po refers to 'predicate object'
-        self._po = po
+    sources = "uniprot." + chunk["DB Object ID"]
+    targets = chunk["GO ID"].str.replace("GO:", "go.", regex=False)
+    mask = sources.isin(proteins) & targets.isin(go_terms)
 
-    @property
-    def is_deprecated(self):
-        for p, o in self._po:
-            if p == _term.URIRef("http://www.w3.org/2002/07/owl#deprecated"):
-                if o == _term.Literal("true", datatype=_term.URIRef("http://www.w3.org/2001/XMLSchema#boolean")):
-                    return True
-        return False
+    df = _pd.DataFrame(
+        {
+            "sourceDomainId": sources[mask],
+            "targetDomainId": targets[mask],
+            "qualifiers": chunk["Qualifier"][mask].str.split("|"),
+        }
+    )
+    df = df.explode("qualifiers").drop_duplicates()
+    return df.groupby(["sourceDomainId", "targetDomainId"], sort=False)["qualifiers"].agg(list)
+
+
+_RDF = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+_RDFS = "{http://www.w3.org/2000/01/rdf-schema#}"
+_OWL = "{http://www.w3.org/2002/07/owl#}"
+_OBO_IN_OWL = "{http://www.geneontology.org/formats/oboInOwl#}"
+
+# NOTE: Tags and attributes are compared against these (interned) constants,
+#       rather than building predicate strings for every triple.
+_OWL_CLASS = _sys.intern(f"{_OWL}Class")
+_OWL_DEPRECATED = _sys.intern(f"{_OWL}deprecated")
+_RDF_ABOUT = _sys.intern(f"{_RDF}about")
+_RDF_RESOURCE = _sys.intern(f"{_RDF}resource")
+_RDFS_LABEL = _sys.intern(f"{_RDFS}label")
+_RDFS_SUBCLASS_OF = _sys.intern(f"{_RDFS}subClassOf")
+_OBO_ID = _sys.intern(f"{_OBO_IN_OWL}id")
+_OBO_EXACT_SYNONYM = _sys.intern(f"{_OBO_IN_OWL}hasExactSynonym")
+_IAO_DEFINITION = _sys.intern("{http://purl.obolibrary.org/obo/}IAO_0000115")
+
+_GO_PREFIX = "http://purl.obolibrary.org/obo/GO_"
+
+
+class GOTerm:
+    def __init__(self, elem):
+        self._iri = elem.get(_RDF_ABOUT)
+        self._id = None
+        self.is_deprecated = False
+        self.display_name = None
+        self.description = None
+        self.synonyms: list[str] = []
+        self.is_a: list[str] = []
+
+        # Single scan over the children of the owl:Class element.
+        for child in elem:
+            tag = child.tag
+            if tag == _RDFS_SUBCLASS_OF:
+                # NOTE: Restrictions (e.g., part_of) are nested elements, and
+                #       don't have an rdf:resource attribute.
+                parent = child.get(_RDF_RESOURCE)
+                if parent and parent.startswith(_GO_PREFIX):
+                    self.is_a.append(parent.replace(_GO_PREFIX, "go."))
+            elif tag == _OBO_EXACT_SYNONYM:
+                self.synonyms.append(child.text or "")
+            elif tag == _OBO_ID:
+                self._id = child.text
+            elif tag == _RDFS_LABEL:
+                self.display_name = child.text
+            elif tag == _IAO_DEFINITION:
+                self.description = child.text
+            elif tag == _OWL_DEPRECATED:
+                self.is_deprecated = child.text == "true"
 
     @property
     def primary_id(self):
-        for p, o in self._po:
-            if str(p) == "http://www.geneontology.org/formats/oboInOwl#id":
-                return str(o).replace("GO:", "go.")
-        raise Exception(f"{[(p,o,) for p, o in self._po]}")
-
-    @property
-    def display_name(self):
-        for p, o in self._po:
-            if str(p) == "http://www.w3.org/2000/01/rdf-schema#label":
-                return str(o)
-
-    @property
-    def synonyms(self):
-        return [str(o) for p, o in self._po if str(p) == "http://www.geneontology.org/formats/oboInOwl#hasExactSynonym"]
-
-    @property
-    def description(self):
-        for p, o in self._po:
-            if str(p) == "http://purl.obolibrary.org/obo/IAO_0000115":
-                return str(o)
-
-    @property
-    def is_a(self):
-        subclass_url = "http://www.w3.org/2000/01/rdf-schema#subClassOf"
-        go_prefix = "http://purl.obolibrary.org/obo/GO_"
-        return [
-            str(o).replace("http://purl.obolibrary.org/obo/GO_", "go.")
-            for p, o in self._po
-            if str(p) == subclass_url and str(o).startswith(go_prefix)
-        ]
+        if self._id is None:
+            raise Exception(f"GO term {self._iri!r} does not have an oboInOwl:id")
+        return self._id.replace("GO:", "go.")
 
     def parse_go_term(self):
         go = GO()
@@ -134,47 +139,58 @@ class GORelations:
         ]
 
 
-def get_go_details(g):
-    go_details = _defaultdict(list)
+def iter_go_terms(path):
+    """Streams the GO terms (owl:Class elements with a GO IRI) from an OWL (RDF/XML) file"""
+    for _, elem in _etree.iterparse(f"{path}", events=("end",)):
+        parent = elem.getparent()
+        # Only consider top-level elements (children of rdf:RDF).
+        if parent is None or parent.getparent() is not None:
+            continue
 
-    for s, p, o in g:
-        if str(s).startswith("http://purl.obolibrary.org/obo/GO_"):
-            go_details[s].append((p, o))
+        if elem.tag == _OWL_CLASS and (elem.get(_RDF_ABOUT) or "").startswith(_GO_PREFIX):
+            yield GOTerm(elem)
 
-    return go_details
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
 
 
 def parse_go():
-    g = _Graph()
-    logger.info("Parsing OWL core")
-    g.parse(get_file_location("go_core_owl"))
-    logger.info("Consolidating relationships")
-    details = get_go_details(g)
+    logger.info("Parsing and storing GO terms and relationships between GO terms")
+    terms, relationships = [], []
 
-    logger.info("Parsing and storing GO terms")
-    updates = (GORelations(value) for value in details.values())
-    updates = (go_rel.parse_go_term().generate_update() for go_rel in updates if not go_rel.is_deprecated)
-    for chunk in _tqdm(_chunked(updates, 1_000), leave=False, desc="Parsing GO terms"):
-        MongoInstance.DB[GO.collection_name].bulk_write(chunk)
+    for term in _tqdm(iter_go_terms(get_file_location("go_core_owl")), leave=False, desc="Parsing GO terms"):
+        if not term.is_deprecated:
+            terms.append(term.parse_go_term().generate_update())
+        relationships += [rel.generate_update() for rel in term.parse_go_relationships()]
 
-    logger.info("Parsing and storing relationships between GO terms")
-    updates = (GORelations(value).parse_go_relationships() for value in details.values())
-    for chunk in _tqdm(_chunked(updates, 1_000), leave=False, desc="Parsing relationships between GO terms"):
-        chunk = [rel.generate_update() for rel in _chain(*chunk)]
-        MongoInstance.DB[GOIsSubtypeOfGO.collection_name].bulk_write(chunk)
+        if len(terms) >= 1_000:
+            MongoInstance.DB[GO.collection_name].bulk_write(terms)
+            terms = []
+        if len(relationships) >= 1_000:
+            MongoInstance.DB[GOIsSubtypeOfGO.collection_name].bulk_write(relationships)
+            relationships = []
+
+    if terms:
+        MongoInstance.DB[GO.collection_name].bulk_write(terms)
+    if relationships:
+        MongoInstance.DB[GOIsSubtypeOfGO.collection_name].bulk_write(relationships)
 
 
 def parse_goa():
-    go_terms = {doc["primaryDomainId"] for doc in GO.find(MongoInstance.DB)}
-    proteins = {doc["primaryDomainId"] for doc in Protein.find(MongoInstance.DB)}
+    go_terms = [doc["primaryDomainId"] for doc in GO.find(MongoInstance.DB)]
+    proteins = [doc["primaryDomainId"] for doc in Protein.find(MongoInstance.DB)]
 
     file = get_file_location("go_annotations")
 
-    go_associations = iter_go_associations(file)
-    go_associations = (GOAssociation(assoc) for assoc in go_associations if assoc["DB"] == "UniProtKB")
-    go_associations = (assoc for assoc in go_associations if assoc.source_domain_id in proteins)
-    go_associations = (assoc for assoc in go_associations if assoc.target_domain_id in go_terms)
+    for chunk in _tqdm(iter_go_association_chunks(file), leave=False, desc="Parsing GO annotations for proteins"):
+        grouped = group_go_associations(chunk, proteins, go_terms)
 
-    for chunk in _tqdm(_chunked(go_associations, 1_000), leave=False, desc="Parsing GO annotations for proteins"):
-        update = [assoc.parse().generate_update() for assoc in chunk]
-        MongoInstance.DB[ProteinHasGOAnnotation.collection_name].bulk_write(update)
+        updates = (
+            ProteinHasGOAnnotation(
+                sourceDomainId=source, targetDomainId=target, qualifiers=qualifiers, dataSources=["go"]
+            ).generate_update()
+            for (source, target), qualifiers in grouped.items()
+        )
+        for batch in _chunked(updates, 10_000):
+            MongoInstance.DB[ProteinHasGOAnnotation.collection_name].bulk_write(batch)
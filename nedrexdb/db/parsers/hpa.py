@@ -1,12 +1,17 @@
-import gzip
-import xml.etree.cElementTree as et
-from itertools import chain
+from io import BytesIO
+from multiprocessing import Pool
 
+from lxml import etree
 from tqdm import tqdm
-from more_itertools import chunked
 
 from nedrexdb.db import MongoInstance
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import (
+    _bounded_imap,
+    _get_file_location_factory,
+    _get_worker_count,
+    _gunzip_stream,
+    _iter_xml_blocks,
+)
 from nedrexdb.db.models.nodes.tissue import Tissue
 from nedrexdb.db.models.nodes.gene import Gene
 from nedrexdb.db.models.nodes.protein import Protein
@@ -15,6 +20,12 @@ from nedrexdb.db.models.edges.protein_expressed_in_tissue import ProteinExpresse
 
 get_file_location = _get_file_location_factory("hpa")
 
+_RNA_EXPRESSION_LEVELS = {
+    "normalizedRNAExpression": "nTPM",
+    "proteinCodingRNAExpression": "pTPM",
+    "RNAExpression": "TPM",
+}
+
 
 class HPAEntry:
     def __init__(self, entry):
@@ -52,7 +63,11 @@ class HPAEntry:
         rna_expression_elem = self.__entry.find("rnaExpression")
         expression = []
 
-        for item in rna_expression_elem.findall("data"):
+        if rna_expression_elem is None:
+            self.__rna_expression = expression
+            return self.__rna_expression
+
+        for item in rna_expression_elem.iterfind("data"):
             tissue = item.find("tissue")
             tissue_obj = get_tissue(tissue)
             if tissue_obj is None:
@@ -60,14 +75,12 @@ class HPAEntry:
 
             data = {"tissue": tissue_obj}
 
-            for key, xpath in [
-                ("nTPM", "./level[@type='normalizedRNAExpression']"),
-                ("pTPM", "./level[@type='proteinCodingRNAExpression']"),
-                ("TPM", "./level[@type='RNAExpression']"),
-            ]:
-                expr = item.find(xpath)
-                if expr is not None:
-                    data[key] = float(expr.get("expRNA"))
+            # NOTE: A single scan over the levels of the data point (rather
+            #       than one XPath query per expression type).
+            for level in item.iterfind("level"):
+                key = _RNA_EXPRESSION_LEVELS.get(level.get("type"))
+                if key is not None and key not in data:
+                    data[key] = float(level.get("expRNA"))
 
             expression.append(data)
 
@@ -111,67 +124,102 @@ def get_tissue(tissue):
     return uberon_ids
 
 
-def iter_entries():
+# Gene, protein and tissue IDs in NeDRexDB, set in each worker process by _set_ids
+_genes: set[str] = set()
+_proteins: set[str] = set()
+_tissues: set[str] = set()
+
+
+def _set_ids(genes: set[str], proteins: set[str], tissues: set[str]) -> None:
+    global _genes, _proteins, _tissues
+    _genes, _proteins, _tissues = genes, proteins, tissues
+
+
+def _parse_entry(elem):
+    # NOTE: Expression is only read for entries with genes (or proteins) in
+    #       NeDRexDB, and returned as plain tuples for tissues in NeDRexDB.
+    entry = HPAEntry(elem)
+    genes = [gene for gene in entry.genes if gene in _genes]
+    proteins = [protein for protein in entry.proteins if protein in _proteins]
+
+    gene_expression = [
+        (gene, tissue, rna_expr.get("TPM"), rna_expr.get("nTPM"), rna_expr.get("pTPM"))
+        for gene in genes
+        for rna_expr in entry.rna_expression
+        for tissue in rna_expr["tissue"]
+        if tissue in _tissues
+    ]
+    protein_expression = [
+        (protein, tissue, pro_expr["level"])
+        for protein in proteins
+        for pro_expr in entry.protein_expression
+        for tissue in pro_expr["tissue"]
+        if tissue in _tissues
+    ]
+
+    return gene_expression, protein_expression
+
+
+def _parse_entries(block: bytes):
+    # NOTE: This function runs in worker processes, on a block of <entry>
+    #       elements split from the HPA XML.
+    results = []
+
+    for _, elem in etree.iterparse(BytesIO(block), events=("end",), tag="entry"):
+        results.append(_parse_entry(elem))
+
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    return results
+
+
+def iter_entries(genes: set[str], proteins: set[str], tissues: set[str]):
+    """Yields the (gene, protein) expression tuples of each HPA entry, for the given genes, proteins and tissues"""
     fname = get_file_location("all")
-    with gzip.open(fname, "rt") as f:
-        xml_parser = et.iterparse(f, events=("end",))
+    workers = _get_worker_count()
+
+    # NOTE: The IDs are sent to each worker once, when the pool starts, so that
+    #       entries are filtered in the workers.
+    with _gunzip_stream(fname) as f, Pool(workers, initializer=_set_ids, initargs=(genes, proteins, tissues)) as pool:
+        blocks = _iter_xml_blocks(f, b"entry", block_size=1024 * 1024)
+        for results in _bounded_imap(pool, _parse_entries, blocks, max_pending=2 * workers):
+            yield from results
 
-        for _, elem in xml_parser:
-            if elem.tag != "entry":
-                continue
 
-            entry = HPAEntry(elem)
-            gene_expression = []
-            protein_expression = []
-
-            for gene in entry.genes:
-                for rna_expr in entry.rna_expression:
-                    gene_expression += [
-                        GeneExpressedInTissue(
-                            sourceDomainId=gene,
-                            targetDomainId=tissue,
-                            TPM=rna_expr.get("TPM"),
-                            nTPM=rna_expr.get("nTPM"),
-                            pTPM=rna_expr.get("pTPM"),
-                            dataSources=["hpa"],
-                        )
-                        for tissue in rna_expr["tissue"]
-                    ]
-
-            for protein in entry.proteins:
-                for pro_expr in entry.protein_expression:
-                    protein_expression += [
-                        ProteinExpressedInTissue(
-                            sourceDomainId=protein, targetDomainId=tissue, level=pro_expr["level"], dataSources=["hpa"]
-                        )
-                        for tissue in pro_expr["tissue"]
-                    ]
-
-            yield gene_expression, protein_expression
-
-            elem.clear()
-
-
-def parse_hpa():
+def parse_hpa(batch_size: int = 10_000):
     tissues = {i["primaryDomainId"] for i in Tissue.find(MongoInstance.DB)}
     genes = {i["primaryDomainId"] for i in Gene.find(MongoInstance.DB)}
     proteins = {i["primaryDomainId"] for i in Protein.find(MongoInstance.DB)}
 
-    for chunk in tqdm(chunked(iter_entries(), 10), leave=False):
-        gene_expression, protein_expression = zip(*chunk)
-
-        gene_expression = [
-            item.generate_update()
-            for item in chain(*gene_expression)
-            if item.sourceDomainId in genes and item.targetDomainId in tissues
+    gene_updates, protein_updates = [], []
+
+    # NOTE: Writes are batched by the number of edges (rather than by the
+    #       number of entries), because entries vary greatly in size.
+    entries = iter_entries(genes, proteins, tissues)
+    for gene_expression, protein_expression in tqdm(entries, leave=False, desc="Parsing HPA"):
+        gene_updates += [
+            GeneExpressedInTissue(
+                sourceDomainId=gene, targetDomainId=tissue, TPM=tpm, nTPM=ntpm, pTPM=ptpm, dataSources=["hpa"]
+            ).generate_update()
+            for gene, tissue, tpm, ntpm, ptpm in gene_expression
         ]
-        if gene_expression:
-            MongoInstance.DB[GeneExpressedInTissue.collection_name].bulk_write(gene_expression)
-
-        protein_expression = [
-            item.generate_update()
-            for item in chain(*protein_expression)
-            if item.sourceDomainId in proteins and item.targetDomainId in tissues
+        if len(gene_updates) >= batch_size:
+            MongoInstance.DB[GeneExpressedInTissue.collection_name].bulk_write(gene_updates)
+            gene_updates = []
+
+        protein_updates += [
+            ProteinExpressedInTissue(
+                sourceDomainId=protein, targetDomainId=tissue, level=level, dataSources=["hpa"]
+            ).generate_update()
+            for protein, tissue, level in protein_expression
         ]
-        if protein_expression:
-            MongoInstance.DB[ProteinExpressedInTissue.collection_name].bulk_write(protein_expression)
+        if len(protein_updates) >= batch_size:
+            MongoInstance.DB[ProteinExpressedInTissue.collection_name].bulk_write(protein_updates)
+            protein_updates = []
+
+    if gene_updates:
+        MongoInstance.DB[GeneExpressedInTissue.collection_name].bulk_write(gene_updates)
+    if protein_updates:
+        MongoInstance.DB[ProteinExpressedInTissue.collection_name].bulk_write(protein_updates)
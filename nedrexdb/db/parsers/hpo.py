@@ -1,8 +1,8 @@
+import re as _re
 import warnings as _warnings
+from collections import defaultdict as _defaultdict
 from csv import DictReader as _DictReader
-from functools import lru_cache as _lru_cache
 
-import obonet
 from more_itertools import chunked
 from tqdm import tqdm as _tqdm
 
@@ -15,9 +15,63 @@ from nedrexdb.db.models.edges.disorder_has_phenotype import DisorderHasPhenotype
 get_file_location = _get_file_location_factory("hpo")
 
 
-@_lru_cache(maxsize=None)
-def get_disorder_by_domain_id(domain_id):
-    return [disorder["primaryDomainId"] for disorder in Disorder.find(MongoInstance.DB, {"domainIds": domain_id})]
+def disorder_domain_id_map() -> dict[str, list[str]]:
+    """Maps the OMIM and Orphanet IDs of disorders to their primary domain IDs"""
+    d = _defaultdict(list)
+
+    for disorder in Disorder.find(MongoInstance.DB, projection={"domainIds": 1, "primaryDomainId": 1}):
+        for domain_id in disorder["domainIds"]:
+            if domain_id.startswith(("omim.", "orpha.")):
+                d[domain_id].append(disorder["primaryDomainId"])
+
+    return d
+
+
+# NOTE: Same tag-value line format as used by obonet, i.e., trailing modifiers
+#       ({...}) and comments (! ...) are not part of the value.
+_OBO_TAG_LINE_REGEX = _re.compile(
+    r"^(?P<tag>.+?): *(?P<value>.+?) ?(?P<trailing_modifier>(?<!\\)\{.*?(?<!\\)\})? ?(?P<comment>(?<!\\)!.*?)?$"
+)
+_OBO_SINGULAR_TAGS = frozenset(("id", "name", "def", "comment", "is_obsolete"))
+
+
+def iter_obo_terms(path):
+    """Streams (id, data) pairs for the non-obsolete [Term] stanzas of an OBO file
+
+    Tags that may occur more than once in a stanza (e.g., alt_id, synonym) are
+    collected in lists.
+    """
+
+    def stanza_terms(stanza, data):
+        if stanza == "[Term]" and "id" in data and data.get("is_obsolete") != "true":
+            yield data.pop("id"), data
+
+    with open(path, "r") as f:
+        stanza, data = None, {}
+
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("!"):
+                continue
+
+            if line.startswith("["):
+                yield from stanza_terms(stanza, data)
+                stanza, data = line, {}
+                continue
+
+            if stanza is None:
+                continue
+
+            match = _OBO_TAG_LINE_REGEX.match(line)
+            if match is None:
+                continue
+            tag, value = match.group("tag", "value")
+            if tag in _OBO_SINGULAR_TAGS:
+                data[tag] = value
+            else:
+                data.setdefault(tag, []).append(value)
+
+        yield from stanza_terms(stanza, data)
 
 
 class HPONode:
@@ -93,8 +147,7 @@ class HPOARow:
     def __init__(self, row):
         self._row = row
 
-    @property
-    def source_domain_ids(self):
+    def source_domain_ids(self, disorder_map: dict[str, list[str]]) -> list[str]:
         disorder = self._row["DatabaseID"]
         if disorder.startswith("OMIM"):
             d = disorder.replace("OMIM:", "omim.")
@@ -106,29 +159,37 @@ class HPOARow:
             _warnings.warn("disorder encountered without prefix handler in HPOA parser")
             return []
 
-        return get_disorder_by_domain_id(d)
+        return disorder_map.get(d, [])
 
     @property
     def target_domain_id(self):
         return self._row["HPO_ID"].replace("HP:", "hpo.")
 
-    def parse(self):
+    def parse(self, disorder_map: dict[str, list[str]]):
         return [
             DisorderHasPhenotype(sourceDomainId=source, targetDomainId=self.target_domain_id, dataSources=["hpo"])
-            for source in self.source_domain_ids
+            for source in self.source_domain_ids(disorder_map)
         ]
 
 
 def parse_phenotypes():
-    g = obonet.read_obo(get_file_location("obo"))
-    for node, data in g.nodes(data=True):
+    for node, data in iter_obo_terms(get_file_location("obo")):
         yield HPONode(node, data).parse()
 
 
 def parse_hpoa():
     f = get_file_location("annotations")
+    disorder_map = disorder_domain_id_map()
+
+    # NOTE: Rows for the same disorder-phenotype pair (differing only by, e.g.,
+    #       evidence or reference) result in a single edge.
+    seen = set()
     for row in HPOAParser(f).rows():
-        yield from row.parse()
+        for rel in row.parse(disorder_map):
+            pair = (rel.sourceDomainId, rel.targetDomainId)
+            if pair not in seen:
+                seen.add(pair)
+                yield rel
 
 
 def parse():
@@ -139,4 +200,3 @@ def parse():
     for chunk in _tqdm(chunked(parse_hpoa(), 1_000), leave=False, desc="Parsing HPO disorder-phenotype relationships"):
         updates = [rel.generate_update() for rel in chunk]
         MongoInstance.DB[DisorderHasPhenotype.collection_name].bulk_write(updates)
-    get_disorder_by_domain_id.cache_clear()
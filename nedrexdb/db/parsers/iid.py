@@ -1,6 +1,7 @@
+import csv as _csv
 import gzip as _gzip
-from csv import DictReader as _DictReader
 from pathlib import Path as _Path
+from typing import Optional as _Optional
 
 from more_itertools import chunked as _chunked
 from tqdm import tqdm as _tqdm
@@ -180,20 +181,66 @@ _SUBCELLULAR_LOCATIONS = [
 ]
 
 
+class IIDColumns:
+    """Column indices of an IID file, resolved once from its header
+
+    Context columns (e.g., tissues) are grouped per category as (index, label)
+    pairs, with the labels capitalised in advance; the labels keep the order of
+    the category, rather than that of the header.
+    """
+
+    def __init__(self, fieldnames: list[str]):
+        index = {name: i for i, name in enumerate(fieldnames)}
+
+        def resolve(names) -> list[tuple[int, str]]:
+            return [(index[name], name.capitalize()) for name in names if name in index]
+
+        self.uniprot1 = index["uniprot1"]
+        self.uniprot2 = index["uniprot2"]
+        self.methods = index["methods"]
+        self.evidence_type = index["evidence_type"]
+
+        self._width = len(fieldnames)
+        self._required = max(self.uniprot1, self.uniprot2, self.methods, self.evidence_type)
+
+        self.development_stages = resolve(_DEVELOPMENT_STAGES)
+        self.tissues = resolve(_TISSUES)
+        self.joint_tissues = resolve(_JOINT_TISSUES)
+        self.brain_tissues = resolve(_BRAIN_TISSUES)
+        self.subcellular_locations = resolve(_SUBCELLULAR_LOCATIONS)
+
+    def pad(self, row: list[str]) -> _Optional[list[str]]:
+        """Pads a short (e.g., truncated) row with empty context columns
+
+        Returns None if the row is missing the members, methods or evidence types.
+        """
+        if len(row) >= self._width:
+            return row
+        if len(row) <= self._required:
+            return None
+        return row + [""] * (self._width - len(row))
+
+
 class IIDRow:
-    def __init__(self, row):
+    def __init__(self, row: list[str], columns: IIDColumns):
         self._row = row
+        self._columns = columns
+
+    def _labels(self, columns: list[tuple[int, str]]) -> list[str]:
+        row = self._row
+        return [label for i, label in columns if row[i] == "2"]
 
     def get_member_one(self) -> str:
-        return f"uniprot.{self._row['uniprot1']}"
+        return f"uniprot.{self._row[self._columns.uniprot1]}"
 
     def get_member_two(self) -> str:
-        return f"uniprot.{self._row['uniprot2']}"
+        return f"uniprot.{self._row[self._columns.uniprot2]}"
 
     def get_methods(self) -> list[str]:
-        if self._row["methods"] == "-":
+        methods = self._row[self._columns.methods]
+        if methods == "-":
             return []
-        return [i.strip() for i in self._row["methods"].split("|")]
+        return [i.strip() for i in methods.split("|")]
 
     def get_databases(self) -> list[str]:
         return ["iid"]
@@ -204,22 +251,22 @@ class IIDRow:
     #     return [i.strip() for i in self._row["dbs"].split(";")]
 
     def get_development_stages(self) -> list[str]:
-        return [stage.capitalize() for stage in _DEVELOPMENT_STAGES if self._row.get(stage) == "2"]
+        return self._labels(self._columns.development_stages)
 
     def get_tissues(self) -> list[str]:
-        return [tissue.capitalize() for tissue in _TISSUES if self._row.get(tissue) == "2"]
+        return self._labels(self._columns.tissues)
 
     def get_joint_tissues(self) -> list[str]:
-        return [joint_tissue.capitalize() for joint_tissue in _JOINT_TISSUES if self._row.get(joint_tissue) == "2"]
+        return self._labels(self._columns.joint_tissues)
 
     def get_brain_tissues(self) -> list[str]:
-        return [brain_tissue.capitalize() for brain_tissue in _BRAIN_TISSUES if self._row.get(brain_tissue) == "2"]
+        return self._labels(self._columns.brain_tissues)
 
     def get_subcellular_locations(self) -> list[str]:
-        return [location.capitalize() for location in _SUBCELLULAR_LOCATIONS if self._row.get(location) == "2"]
+        return self._labels(self._columns.subcellular_locations)
 
     def get_evidence_types(self) -> list[str]:
-        return [i.strip() for i in self._row["evidence_type"].split("|")]
+        return [i.strip() for i in self._row[self._columns.evidence_type].split("|")]
 
     def parse(self) -> _PPI:
         ppi = _PPI(
@@ -252,13 +299,16 @@ class IIDParser:
         else:
             f = self.f.open()
 
-        proteins = {i["primaryDomainId"] for i in _Protein.find(MongoInstance.DB)}
+        proteins = {i["primaryDomainId"] for i in _Protein.find(MongoInstance.DB, projection={"primaryDomainId": 1})}
+
+        reader = _csv.reader(f, delimiter="\t")
+        columns = IIDColumns([name.strip() for name in next(reader)])
 
-        fieldnames = next(f).strip().split("\t")
-        reader = _DictReader(f, delimiter="\t", fieldnames=fieldnames)
-        updates = (IIDRow(row).parse() for row in reader)
-        updates = (ppi for ppi in updates if ppi.memberOne in proteins and ppi.memberTwo in proteins)
-        updates = (ppi.generate_update() for ppi in updates)
+        rows = (IIDRow(row, columns) for row in map(columns.pad, reader) if row is not None)
+        # NOTE: Rows are filtered on their members before the context columns
+        #       are scanned.
+        rows = (row for row in rows if row.get_member_one() in proteins and row.get_member_two() in proteins)
+        updates = (row.parse().generate_update() for row in rows)
 
         for chunk in _tqdm(_chunked(updates, 1_000), leave=False, desc="Parsing IID"):
             MongoInstance.DB[_PPI.collection_name].bulk_write(chunk)
@@ -1,5 +1,6 @@
-from csv import DictReader as _DictReader
+from functools import partial as _partial
 from itertools import product as _product
+from multiprocessing import Pool as _Pool
 from zipfile import ZipFile as _ZipFile
 
 from more_itertools import chunked as _chunked
@@ -8,21 +9,22 @@ from tqdm import tqdm as _tqdm
 from nedrexdb.db import MongoInstance
 from nedrexdb.db.models.nodes.protein import Protein
 from nedrexdb.db.models.edges.protein_interacts_with_protein import ProteinInteractsWithProtein
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import (
+    _bounded_imap,
+    _get_file_location_factory,
+    _get_worker_count,
+    _iter_line_blocks,
+)
 
 get_file_location = _get_file_location_factory("intact")
 
+_HUMAN_TAXID = b"taxid:9606(human)|taxid:9606(Homo sapiens)"
 
-def get_interactors(row, interactor):
-    if interactor in {"A", "B"}:
-        main_id_key = f"ID(s) interactor {interactor}"
-        alt_id_key = f"Alt. ID(s) interactor {interactor}"
-    else:
-        raise Exception(f"Invalid interactor {interactor=!r}")
 
+def get_interactors(ids: str, alt_ids: str) -> list[str]:
     interactors = set()
-    interactors.add(row[main_id_key])
-    interactors.update(row[alt_id_key].split("|"))
+    interactors.add(ids)
+    interactors.update(alt_ids.split("|"))
     interactors.discard("-")
 
     interactors = [pro.replace("uniprotkb:", "uniprot.") for pro in interactors if pro.startswith("uniprotkb:")]
@@ -30,35 +32,58 @@ def get_interactors(row, interactor):
     return interactors
 
 
-class IntActRow:
-    def __init__(self, row):
-        self._row = row
+def _parse_intact_lines(columns: dict[str, int], block: bytes) -> set[tuple[str, str]]:
+    # NOTE: This function runs in worker processes. Lines are only split (and
+    #       the ID columns decoded) if the human taxid occurs twice in the raw
+    #       line, which skips most non-human interactions.
+    taxid_a, taxid_b = columns["Taxid interactor A"], columns["Taxid interactor B"]
+    id_a, id_b = columns["ID(s) interactor A"], columns["ID(s) interactor B"]
+    alt_a, alt_b = columns["Alt. ID(s) interactor A"], columns["Alt. ID(s) interactor B"]
 
-    def parse(self):
-        a_interactors = get_interactors(self._row, "A")
-        b_interactors = get_interactors(self._row, "B")
+    pairs = set()
+    for line in block.splitlines():
+        if line.count(_HUMAN_TAXID) < 2:
+            continue
 
+        fields = line.split(b"\t")
+        if fields[taxid_a] != _HUMAN_TAXID or fields[taxid_b] != _HUMAN_TAXID:
+            continue
+
+        a_interactors = get_interactors(fields[id_a].decode("utf-8"), fields[alt_a].decode("utf-8"))
+        b_interactors = get_interactors(fields[id_b].decode("utf-8"), fields[alt_b].decode("utf-8"))
         for a, b in _product(a_interactors, b_interactors):
-            a, b = sorted([a, b])
+            pairs.add(tuple(sorted([a, b])))
+
+    return pairs
 
-            yield ProteinInteractsWithProtein(memberOne=a, memberTwo=b, dataSources=["intact"])
 
+def parse_ppis() -> set[tuple[str, str]]:
+    """Returns the unique (sorted) pairs of UniProt IDs of human interactions in IntAct"""
+    workers = _get_worker_count()
+    pairs = set()
 
-def parse_ppis():
     zf = _ZipFile(get_file_location("psimitab"))
-    with zf.open("intact.txt", "r") as f:
-        f = (line.decode("utf-8") for line in f)
-        fieldnames = next(f)[1:-1].split("\t")
-        reader = _DictReader(f, fieldnames=fieldnames, delimiter="\t")
-        reader = (row for row in reader if row["Taxid interactor A"] == "taxid:9606(human)|taxid:9606(Homo sapiens)")
-        reader = (row for row in reader if row["Taxid interactor B"] == "taxid:9606(human)|taxid:9606(Homo sapiens)")
-        for row in reader:
-            yield from IntActRow(row).parse()
+    with zf.open("intact.txt", "r") as f, _Pool(workers) as pool:
+        fieldnames = f.readline().decode("utf-8")[1:].rstrip("\r\n").split("\t")
+        columns = {name: i for i, name in enumerate(fieldnames)}
+
+        blocks = _iter_line_blocks(f)
+        func = _partial(_parse_intact_lines, columns)
+        for block_pairs in _tqdm(
+            _bounded_imap(pool, func, blocks, max_pending=2 * workers), leave=False, desc="Reading IntAct"
+        ):
+            pairs.update(block_pairs)
+
+    return pairs
 
 
 def parse():
-    proteins = {i["primaryDomainId"] for i in Protein.find(MongoInstance.DB)}
-    updates = (ppi.generate_update() for ppi in parse_ppis() if ppi.memberOne in proteins and ppi.memberTwo in proteins)
+    proteins = {i["primaryDomainId"] for i in Protein.find(MongoInstance.DB, projection={"primaryDomainId": 1})}
+    updates = (
+        ProteinInteractsWithProtein(memberOne=a, memberTwo=b, dataSources=["intact"]).generate_update()
+        for a, b in parse_ppis()
+        if a in proteins and b in proteins
+    )
 
     for chunk in _tqdm(_chunked(updates, 1_000), leave=False, desc="Parsing PPIs from IntAct"):
         MongoInstance.DB[ProteinInteractsWithProtein.collection_name].bulk_write(chunk)
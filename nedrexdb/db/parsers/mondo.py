@@ -1,10 +1,12 @@
 import json as _json
 from functools import lru_cache
+from itertools import groupby as _groupby
+from operator import itemgetter as _itemgetter
 
 from more_itertools import chunked as _chunked
 
 from nedrexdb.db import MongoInstance
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import _get_file_location_factory, _iter_obo_graph_json
 from nedrexdb.db.models.nodes.disorder import Disorder
 from nedrexdb.db.models.edges.disorder_is_subtype_of_disorder import (
     DisorderIsSubtypeOfDisorder,
@@ -152,22 +154,29 @@ def _parse_edges(edges):
         yield diad.generate_update()
 
 
-def parse_mondo_json():
-    # Get the filename based on the config
-    filename = get_file_location("json")
-    with open(filename, "r") as f:
-        mondo_data = _json.load(f)
-
-    graph = mondo_data["graphs"].pop()
-
-    nodes = graph["nodes"]
+def _parse_nodes(nodes):
     nodes = filter(_is_mondo_node, nodes)
     nodes = filter(lambda i: not _is_deprecated(i), nodes)
 
-    mondo_records = (MondoRecord(node).parse().generate_update() for node in nodes)
-    for chunk in _chunked(mondo_records, 1_000):
-        MongoInstance.DB[Disorder.collection_name].bulk_write(chunk)
+    for node in nodes:
+        yield MondoRecord(node).parse().generate_update()
+
+
+def parse_mondo_json():
+    # Get the filename based on the config
+    filename = get_file_location("json")
 
-    edges = graph["edges"]
-    for chunk in _chunked(_parse_edges(edges), 1_000):
-        MongoInstance.DB[DisorderIsSubtypeOfDisorder.collection_name].bulk_write(chunk)
+    # NOTE: The nodes and edges of the first graph are streamed from the file,
+    #       rather than loading the whole JSON document. Nodes are written before
+    #       edges are parsed (OBO graph JSON lists nodes first), as edges are
+    #       checked against the disorders in the database.
+    graph = _iter_obo_graph_json(filename, keys=("nodes", "edges"))
+    for key, items in _groupby(graph, key=_itemgetter(0)):
+        items = (item for _, item in items)
+
+        if key == "nodes":
+            for chunk in _chunked(_parse_nodes(items), 1_000):
+                MongoInstance.DB[Disorder.collection_name].bulk_write(chunk)
+        elif key == "edges":
+            for chunk in _chunked(_parse_edges(items), 1_000):
+                MongoInstance.DB[DisorderIsSubtypeOfDisorder.collection_name].bulk_write(chunk)
@@ -1,7 +1,6 @@
 import re as _re
 from collections import defaultdict as _defaultdict
 from csv import DictReader as _DictReader
-from itertools import chain as _chain
 from pathlib import Path as _Path
 from typing import Optional as _Optional
 
@@ -13,32 +12,25 @@ from nedrexdb.db.models.nodes.gene import Gene
 from nedrexdb.db.models.nodes.disorder import Disorder
 from nedrexdb.db.parsers import _get_file_location_factory
 
-
 get_file_location = _get_file_location_factory("omim")
 
 
 class OMIMRow:
-    MIM_MAP_REGEX = _re.compile(r"([0-9]{6} \([0-9]\))")
+    # NOTE: Matches the "<MIM number> (<mapping key>)" token of a phenotype,
+    #       e.g. "Alzheimer disease, 104300 (3)".
+    PHENOTYPE_REGEX = _re.compile(r"([0-9]{6}) \(([0-9])\)")
 
     def __init__(self, row):
         self.row = row
 
-    def parse(self, omim_nedrex_map: dict[str, list[str]]) -> _Optional[list[GeneAssociatedWithDisorder]]:
-        if not self.row["Entrez Gene ID"]:
-            return None
-        gene = f"entrez.{self.row['Entrez Gene ID']}"
-
-        gawd_edges = []
-
-        omim_phenotypes = [i.strip() for i in self.row["Phenotypes"].split(";")]
-        for phenotype in omim_phenotypes:
-            mim_map = self.MIM_MAP_REGEX.findall(phenotype)
-            if not mim_map:
+    def iter_phenotypes(self):
+        """Yields (MIM number, mapping key, flags) for each mapped phenotype of the row"""
+        for phenotype in self.row["Phenotypes"].split(";"):
+            match = self.PHENOTYPE_REGEX.search(phenotype)
+            if match is None:
                 continue
-            assert len(mim_map) == 1
 
-            mim_number, evidence = mim_map.pop().split()
-            evidence = int(evidence[1:-1])
+            mim_number, evidence = match.groups()
 
             flags = []
             if "{" in phenotype:
@@ -46,6 +38,16 @@ class OMIMRow:
             if "?" in phenotype:
                 flags.append("provisional")
 
+            yield mim_number, int(evidence), flags
+
+    def parse(self, omim_nedrex_map: dict[str, list[str]]) -> _Optional[list[GeneAssociatedWithDisorder]]:
+        if not self.row["Entrez Gene ID"]:
+            return None
+        gene = f"entrez.{self.row['Entrez Gene ID']}"
+
+        gawd_edges = []
+
+        for mim_number, evidence, flags in self.iter_phenotypes():
             for disorder in omim_nedrex_map.get(f"omim.{mim_number}", []):
                 gawd = GeneAssociatedWithDisorder(
                     sourceDomainId=gene,
@@ -62,7 +64,7 @@ class OMIMRow:
 def _generate_omim_to_nedrex_map() -> dict[str, list[str]]:
     d = _defaultdict(list)
 
-    for disorder in Disorder.find(MongoInstance.DB):
+    for disorder in Disorder.find(MongoInstance.DB, projection={"domainIds": 1, "primaryDomainId": 1}):
         omim_accs = [acc for acc in disorder["domainIds"] if acc.startswith("omim.")]
         for acc in omim_accs:
             d[acc].append(disorder["primaryDomainId"])
@@ -96,22 +98,27 @@ class GeneMap2Parser:
         if not self.path.exists():
             raise Exception(f"{self.path} does not exist")
 
-    def parse(self):
+    def iter_updates(self):
+        omim_nedrex_map = _generate_omim_to_nedrex_map()
+        genes = {gene["primaryDomainId"] for gene in Gene.find(MongoInstance.DB, projection={"primaryDomainId": 1})}
+
         with self.path.open() as f:
             reader = _DictReader(
                 filter(lambda row: row[0] != self.comment_char, f), delimiter=self.delimiter, fieldnames=self.columns
             )
 
-            omim_nedrex_map = _generate_omim_to_nedrex_map()
-            genes = {gene["primaryDomainId"] for gene in Gene.find(MongoInstance.DB)}
-
-            updates = (OMIMRow(row).parse(omim_nedrex_map) for row in reader)
-            updates = (update for update in updates if update is not None)
-            for chunk in _chunked(updates, 1_000):
-                chunk = [assoc.generate_update() for assoc in _chain(*updates) if assoc.sourceDomainId in genes]
-                if not chunk:
+            for row in reader:
+                # NOTE: Rows for genes that are not in NeDRexDB are skipped
+                #       before their phenotypes are parsed.
+                if f"entrez.{row['Entrez Gene ID']}" not in genes:
                     continue
-                MongoInstance.DB[GeneAssociatedWithDisorder.collection_name].bulk_write(chunk)
+
+                for assoc in OMIMRow(row).parse(omim_nedrex_map):
+                    yield assoc.generate_update()
+
+    def parse(self, batch_size: int = 1_000):
+        for chunk in _chunked(self.iter_updates(), batch_size):
+            MongoInstance.DB[GeneAssociatedWithDisorder.collection_name].bulk_write(chunk)
 
 
 def parse_gene_disease_associations():
@@ -41,31 +41,6 @@ class ReactomeRow:
     def display_name(self):
         return self._row["Event Name"]
 
-    def parse_pathway(self):
-        if not self.is_human:
-            return None
-
-        pathway = Pathway(
-            primaryDomainId=self.reactome_id,
-            domainIds=[self.reactome_id],
-            displayName=self.display_name,
-            species="Homo sapiens",
-            taxid=9606,
-            dataSources=["reactome"],
-        )
-
-        return pathway
-
-    def parse_protein_pathway_link(self):
-        if not self.is_human:
-            return None
-
-        link = ProteinInPathway(
-            sourceDomainId=self.uniprot_id, targetDomainId=self.reactome_id, dataSources=["reactome"]
-        )
-
-        return link
-
 
 class ReactomeParser:
     columns = (
@@ -87,53 +62,54 @@ class ReactomeParser:
         else:
             self.gzipped = False
 
-    def parse_pathways(self):
+    def open(self):
         if self.gzipped:
-            f = _gzip.open(self.f, "rt")
-        else:
-            f = self.f.open()
-
-        reader = _DictReader(f, fieldnames=self.columns, delimiter=self.delimiter)
-
-        updates = (ReactomeRow(row).parse_pathway() for row in reader)
-        updates = (pathway.generate_update() for pathway in updates if pathway is not None)
-
-        # NOTE: The number of iterations and chunks doesn't match what ends up
-        #       NeDRexDB. This is because each row is a *relation* and, thus,
-        #       a single pathway can appear multiple times (as part of many)
-        #       relations).
+            return _gzip.open(self.f, "rt")
+        return self.f.open()
+
+    def parse(self):
+        protein_ids = {i["primaryDomainId"] for i in Protein.find(MongoInstance.DB, projection={"primaryDomainId": 1})}
+
+        # NOTE: Each row is a *relation*, so a single pathway appears in many
+        #       rows; pathways and links are collected in one pass over the
+        #       file, and each is written once.
+        pathways: dict[str, str] = {}
+        links: set[tuple[str, str]] = set()
+
+        with self.open() as f:
+            reader = _DictReader(f, fieldnames=self.columns, delimiter=self.delimiter)
+            for row in _tqdm(map(ReactomeRow, reader), leave=False, desc="Reading Reactome relations"):
+                if not row.is_human:
+                    continue
+
+                pathways[row.reactome_id] = row.display_name
+                if row.uniprot_id in protein_ids:
+                    links.add((row.uniprot_id, row.reactome_id))
+
+        updates = (
+            Pathway(
+                primaryDomainId=reactome_id,
+                domainIds=[reactome_id],
+                displayName=display_name,
+                species="Homo sapiens",
+                taxid=9606,
+                dataSources=["reactome"],
+            ).generate_update()
+            for reactome_id, display_name in pathways.items()
+        )
         for chunk in _tqdm(_chunked(updates, 1_000), leave=False, desc="Parsing pathways"):
             MongoInstance.DB[Pathway.collection_name].bulk_write(chunk)
 
-        f.close()
-
-    def parse_protein_pathway_links(self):
-        if self.gzipped:
-            f = _gzip.open(self.f, "rt")
-        else:
-            f = self.f.open()
-
-        reader = _DictReader(f, fieldnames=self.columns, delimiter=self.delimiter)
-
-        protein_ids = {i["primaryDomainId"] for i in Protein.find(MongoInstance.DB)}
-        pathway_ids = {i["primaryDomainId"] for i in Pathway.find(MongoInstance.DB)}
-
-        updates = (ReactomeRow(row).parse_protein_pathway_link() for row in reader)
-        updates = (update for update in updates if update is not None)
-        updates = (update for update in updates if update.sourceDomainId in protein_ids)
-        updates = (update for update in updates if update.targetDomainId in pathway_ids)
-        updates = (update.generate_update() for update in updates)
-
+        updates = (
+            ProteinInPathway(sourceDomainId=source, targetDomainId=target, dataSources=["reactome"]).generate_update()
+            for source, target in links
+        )
         for chunk in _tqdm(
             _chunked(updates, 1_000), leave=False, desc="Parsing protein-pathway relationships from Reactome"
         ):
             MongoInstance.DB[ProteinInPathway.collection_name].bulk_write(chunk)
 
-        f.close()
-
 
 def parse():
     f = get_file_location("uniprot_annotations")
-    r = ReactomeParser(f)
-    r.parse_pathways()
-    r.parse_protein_pathway_links()
+    ReactomeParser(f).parse()
@@ -1,4 +1,8 @@
 import csv
+from collections import defaultdict
+
+from more_itertools import chunked
+from pymongo import UpdateOne
 
 from nedrexdb.db import MongoInstance
 from nedrexdb.db.parsers import _get_file_location_factory
@@ -7,20 +11,36 @@ from nedrexdb.db.models.nodes.disorder import Disorder
 get_file_location = _get_file_location_factory("repotrial")
 
 
-def parse():
-    fname = get_file_location("mappings")
-
-    dcoll = MongoInstance.DB[Disorder.collection_name]
+def get_omim_icd10_map(fname) -> dict[str, set[str]]:
+    d = defaultdict(set)
 
     with open(fname) as f:
         reader = csv.reader(f, delimiter="\t")
         for omim, icd10 in reader:
-            dcoll.update(
-                {"domainIds": omim},
-                {
-                    "$addToSet": {
-                        "icd10": {"$each": icd10.split("|")},
-                        "dataSources": "repotrial",
-                    }
-                },
+            d[omim].update(icd10.split("|"))
+
+    return d
+
+
+def parse():
+    fname = get_file_location("mappings")
+    omim_icd10_map = get_omim_icd10_map(fname)
+
+    # NOTE: The mapped ICD10 codes are merged (in memory) with the codes already
+    #       on each disorder (from MONDO), so that each disorder is written once.
+    updates = []
+    projection = {"primaryDomainId": 1, "domainIds": 1, "icd10": 1}
+    for disorder in Disorder.find(MongoInstance.DB, {"domainIds": {"$in": list(omim_icd10_map)}}, projection):
+        icd10 = set(disorder.get("icd10", []))
+        for domain_id in disorder["domainIds"]:
+            icd10.update(omim_icd10_map.get(domain_id, []))
+
+        updates.append(
+            UpdateOne(
+                {"primaryDomainId": disorder["primaryDomainId"]},
+                {"$set": {"icd10": sorted(icd10)}, "$addToSet": {"dataSources": "repotrial"}},
             )
+        )
+
+    for chunk in chunked(updates, 1_000):
+        MongoInstance.DB[Disorder.collection_name].bulk_write(chunk)
@@ -49,7 +49,9 @@ def parse():
     pc_db_map = pubchem_to_drugbank_map()
     mt_md_map = umls_to_meddra_map()
 
-    updates = []
+    # NOTE: Frequencies are aggregated per (drug, side effect) pair, keeping the
+    #       minimum and maximum frequency, so each pair is upserted once.
+    frequencies: dict[tuple[str, str], list[float]] = {}
 
     with gzip.open(fname, "rt") as f:
         reader = csv.reader(f, delimiter="\t")
@@ -61,19 +63,29 @@ def parse():
                 continue
 
             drugs = set(chain(*[pc_db_map.get(i, []) for i in row[:2]]))
+            if not drugs:
+                continue
             side_effects = set(chain(*[mt_md_map.get(i, []) for i in [row[2], row[8]]]))
-            min_freq, max_freq = row[5:7]
-
-            for drug, side_effect in product(drugs, side_effects):
-                dhse = DrugHasSideEffect(
-                    sourceDomainId=drug,
-                    targetDomainId=side_effect,
-                    maximum_frequency=float(max_freq),
-                    minimum_frequency=float(min_freq),
-                    dataSources=["sider"],
-                )
-
-                updates.append(dhse.generate_update())
-
-    for chunk in tqdm(chunked(updates, 1_000)):
+            min_freq, max_freq = float(row[5]), float(row[6])
+
+            for pair in product(drugs, side_effects):
+                freqs = frequencies.get(pair)
+                if freqs is None:
+                    frequencies[pair] = [min_freq, max_freq]
+                else:
+                    freqs[0] = min(freqs[0], min_freq)
+                    freqs[1] = max(freqs[1], max_freq)
+
+    updates = (
+        DrugHasSideEffect(
+            sourceDomainId=drug,
+            targetDomainId=side_effect,
+            maximum_frequency=max_freq,
+            minimum_frequency=min_freq,
+            dataSources=["sider"],
+        ).generate_update()
+        for (drug, side_effect), (min_freq, max_freq) in frequencies.items()
+    )
+
+    for chunk in tqdm(chunked(updates, 1_000), leave=False, desc="Parsing SIDER"):
         MongoInstance.DB[DrugHasSideEffect.collection_name].bulk_write(chunk)
@@ -1,20 +1,15 @@
-import json
-
 from more_itertools import chunked
 
 from nedrexdb.db import MongoInstance
-from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.parsers import _get_file_location_factory, _iter_obo_graph_json
 from nedrexdb.db.models.nodes.tissue import Tissue
 
 get_file_location = _get_file_location_factory("uberon")
 
 
 def parse():
-    with open(get_file_location("ext")) as f:
-        uberon = json.load(f)
-
-    nodes = uberon["graphs"][0]["nodes"]
-    uberon_nodes = [node for node in nodes if node["id"].startswith("http://purl.obolibrary.org/obo/UBERON_")]
+    nodes = (node for _, node in _iter_obo_graph_json(get_file_location("ext"), keys=("nodes",)))
+    uberon_nodes = (node for node in nodes if node["id"].startswith("http://purl.obolibrary.org/obo/UBERON_"))
 
     tissues = (
         Tissue(
@@ -1,33 +1,56 @@
 import csv
 import gzip
+from collections import defaultdict
 
-from pymongo import UpdateMany
+from more_itertools import chunked
+from pymongo import UpdateOne
 from tqdm import tqdm
 
 from nedrexdb.db import MongoInstance
 from nedrexdb.db.parsers import _get_file_location_factory
+from nedrexdb.db.models.nodes.drug import Drug
 
 get_file_location = _get_file_location_factory("unichem")
 
 
+def drugbank_to_nedrex_map() -> dict[str, list[str]]:
+    d = defaultdict(list)
+
+    for drug in Drug.find(MongoInstance.DB, projection={"primaryDomainId": 1, "domainIds": 1}):
+        for domain_id in drug["domainIds"]:
+            if domain_id.startswith("drugbank."):
+                d[domain_id].append(drug["primaryDomainId"])
+
+    return d
+
+
 def parse():
     fname = get_file_location("pubchem_drugbank_map")
-    updates = []
 
+    # Group the PubChem IDs per DrugBank ID.
+    pubchem_ids = defaultdict(set)
     with gzip.open(fname, "rt") as f:
         reader = csv.reader(f, delimiter="\t")
         next(reader)  # Skip the header row
 
         for db, pc in tqdm(reader, leave=False):
-            update = UpdateMany(
-                {"domainIds": f"drugbank.{db}"},
-                {
-                    "$addToSet": {"domainIds": f"pubchem.{pc}", "dataSources": "unichem"},
-                },
-                upsert=False,
-            )
-
-            updates.append(update)
-
-    coll = MongoInstance.DB["drug"]
-    coll.bulk_write(updates)
+            pubchem_ids[f"drugbank.{db}"].add(f"pubchem.{pc}")
+
+    # Resolve the DrugBank IDs against the drugs in NeDRexDB, so that each drug
+    # is updated once (by primary ID).
+    db_nedrex_map = drugbank_to_nedrex_map()
+    drug_pubchem_ids = defaultdict(set)
+    for drugbank_id, pcs in pubchem_ids.items():
+        for drug in db_nedrex_map.get(drugbank_id, []):
+            drug_pubchem_ids[drug].update(pcs)
+
+    updates = (
+        UpdateOne(
+            {"primaryDomainId": drug},
+            {"$addToSet": {"domainIds": {"$each": sorted(pcs)}, "dataSources": "unichem"}},
+        )
+        for drug, pcs in drug_pubchem_ids.items()
+    )
+
+    for chunk in chunked(updates, 1_000):
+        MongoInstance.DB[Drug.collection_name].bulk_write(chunk)
@@ -1,15 +1,13 @@
-import os as _os
 import re as _re
 import shutil as _shutil
-import subprocess as _subprocess
 from pathlib import Path as _Path
-from urllib.request import urlretrieve as _urlretrieve
+from zipfile import ZipFile as _ZipFile
 
 import requests  # type: ignore
 from bs4 import BeautifulSoup
 
 from nedrexdb import config as _config
-from nedrexdb.common import change_directory as _cd
+from nedrexdb.common import Downloader as _Downloader
 from nedrexdb.exceptions import (
     AssumptionError as _AssumptionError,
     ProcessError as _ProcessError,
@@ -40,34 +38,23 @@ def download_biogrid():
         f"BIOGRID-ORGANISM-{version}.tab3.zip"
     )
 
-    zip_fname = url.rsplit("/", 1)[1]
-    target_fname = _config.get("sources.biogrid.human_data.filename")
     biogrid_dir = _Path(_config.get("db.root_directory")) / _config.get("sources.directory") / "biogrid"
+    zip_fname = biogrid_dir / url.rsplit("/", 1)[1]
+    target_fname = biogrid_dir / _config.get("sources.biogrid.human_data.filename")
 
     biogrid_dir.mkdir(exist_ok=True, parents=True)
 
-    with _cd(biogrid_dir):
-        # NOTE: we have to remove the old file first, otherwise we get a bug where it gets deleted
-        #       (because iterdir() will delete it).
-        if _os.path.isfile(target_fname):
-            _os.remove(target_fname)
+    logger.debug("Downloading BioGRID v%s" % version)
+    _Downloader(url=url, target=zip_fname, username=None, password=None).download()
 
-        logger.debug("Downloading BioGRID v%s" % version)
-        _urlretrieve(url, zip_fname)
-        _subprocess.call(
-            ["unzip", zip_fname],
-            stdout=_subprocess.DEVNULL,
-            stderr=_subprocess.DEVNULL,
-        )
-        _os.remove(zip_fname)
+    # NOTE: Only the human file is copied out of the (organism) zip, rather
+    #       than extracting every organism and deleting all but one.
+    with _ZipFile(zip_fname) as zf:
+        members = [name for name in zf.namelist() if "Homo_sapiens" in name]
+        if len(members) != 1:
+            raise _AssumptionError(f"expected one BioGRID file containing 'Homo_sapiens', found {len(members)}")
 
-        counter = 0
-        for f in _Path().iterdir():
-            if "Homo_sapiens" in f.name:
-                counter += 1
-                _shutil.move(f.name, target_fname)
-            else:
-                _os.remove(f)
+        with zf.open(members[0]) as src, target_fname.open("wb") as dst:
+            _shutil.copyfileobj(src, dst, 1024 * 1024)
 
-    if counter != 1:
-        raise _AssumptionError("more than one BioGRID file containing 'Homo_sapiens' was found")
+    zip_fname.unlink()
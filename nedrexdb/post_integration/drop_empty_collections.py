@@ -1,16 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from typing import Optional as _Optional
+
 from nedrexdb.db import MongoInstance
 from nedrexdb.logger import logger
 
+_STATS_COLLECTION = "_collections"
+
+
+def _inspect_collection(coll_name: str) -> _Optional[dict]:
+    """Drops the collection if it is empty, and otherwise returns its sizes (from collStats)"""
+    coll = MongoInstance.DB[coll_name]
+    if coll.count_documents({}, limit=1) == 0:
+        # indicates empty collection
+        logger.warning(f"collection {coll_name!r} is empty, dropping")
+        coll.drop()
+        return None
+
+    stats = MongoInstance.DB.command("collStats", coll_name)
+    return {
+        "estimated_document_count": coll.estimated_document_count(),
+        "size_bytes": stats["size"],
+        "storage_size_bytes": stats["storageSize"],
+        "index_size_bytes": stats["totalIndexSize"],
+        "index_sizes": stats["indexSizes"],
+    }
+
 
-def drop_empty_collections():
+def drop_empty_collections(max_workers: int = 8):
     """
     This is requires to ensure that Neo4j export works correctly
+
+    The sizes of the remaining collections are recorded in the `_collections`
+    collection (alongside the profiles written by `collection_stats`).
     """
-    for coll_name in MongoInstance.DB.list_collection_names():
-        coll = MongoInstance.DB[coll_name]
-        try:
-            next(coll.find())
-        except StopIteration:
-            # indicates empty collection
-            logger.warning(f"collection {coll_name!r} is empty, dropping")
-            coll.drop()
+    coll_names = [name for name in MongoInstance.DB.list_collection_names() if name != _STATS_COLLECTION]
+    if not coll_names:
+        return
+
+    with _ThreadPoolExecutor(max_workers=min(max_workers, len(coll_names))) as executor:
+        results = executor.map(_inspect_collection, coll_names)
+
+        for coll_name, sizes in zip(coll_names, results):
+            if sizes is None:
+                MongoInstance.DB[_STATS_COLLECTION].delete_one({"collection": coll_name})
+                continue
+
+            MongoInstance.DB[_STATS_COLLECTION].update_one({"collection": coll_name}, {"$set": sizes}, upsert=True)
@@ -1,4 +1,4 @@
-from itertools import chain
+from more_itertools import chunked
 
 from nedrexdb.db import MongoInstance
 from nedrexdb.db.models.nodes.tissue import Tissue
@@ -6,15 +6,16 @@ from nedrexdb.db.models.edges.gene_expressed_in_tissue import GeneExpressedInTis
 from nedrexdb.db.models.edges.protein_expressed_in_tissue import ProteinExpressedInTissue
 
 
-def trim_uberon():
+def trim_uberon(batch_size: int = 1_000):
     coll_1 = MongoInstance.DB[GeneExpressedInTissue.collection_name]
     coll_2 = MongoInstance.DB[ProteinExpressedInTissue.collection_name]
     tissue_coll = MongoInstance.DB[Tissue.collection_name]
 
-    docs = chain(coll_1.find(), coll_2.find())
-    used_uberon_ids = {doc["targetDomainId"] for doc in docs}
-    all_uberon_ids = {doc["primaryDomainId"] for doc in tissue_coll.find()}
+    # NOTE: distinct is answered from the targetDomainId index, rather than
+    #       sending every expression edge to the client.
+    used_uberon_ids = set(coll_1.distinct("targetDomainId")) | set(coll_2.distinct("targetDomainId"))
+    all_uberon_ids = set(tissue_coll.distinct("primaryDomainId"))
     unused_uberon_ids = all_uberon_ids - used_uberon_ids
 
-    query = {"primaryDomainId": {"$in": list(unused_uberon_ids)}}
-    tissue_coll.delete_many(query)
+    for chunk in chunked(sorted(unused_uberon_ids), batch_size):
+        tissue_coll.delete_many({"primaryDomainId": {"$in": chunk}})
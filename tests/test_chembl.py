@@ -0,0 +1,34 @@
+import os
+import tarfile
+
+from nedrexdb.db.parsers import chembl
+
+
+def test_decompress_if_necessary(tmp_path, monkeypatch):
+    path = tmp_path / "chembl_33_sqlite.tar.gz"
+
+    def write_tarball(content):
+        db = tmp_path / "chembl_33.db"
+        db.write_text(content)
+        with tarfile.open(path, "w:gz") as tar:
+            tar.add(db, arcname="chembl_33/chembl_33.db")
+
+    monkeypatch.setattr(chembl, "get_file_location", lambda label: path)
+    calls = []
+    call = chembl._sp.call
+    monkeypatch.setattr(chembl._sp, "call", lambda *args, **kwargs: calls.append(args) or call(*args, **kwargs))
+
+    write_tarball("first")
+    target = chembl.decompress_if_necessary()
+    assert target == tmp_path / "chembl_33_sqlite"
+    assert (target / "chembl_33.db").read_text() == "first"
+
+    # An unchanged tarball is not extracted again.
+    assert chembl.decompress_if_necessary() == target
+    assert len(calls) == 1
+
+    write_tarball("second")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    chembl.decompress_if_necessary()
+    assert len(calls) == 2
+    assert (target / "chembl_33.db").read_text() == "second"
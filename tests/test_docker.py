@@ -0,0 +1,279 @@
+import importlib
+from unittest import mock
+
+import docker as docker_sdk
+import pytest
+
+import nedrexdb
+from nedrexdb.exceptions import ProcessError
+
+_GB = 1024**3
+
+
+class FakeContainer:
+    def __init__(self, client, name, **kwargs):
+        self.client = client
+        self.name = name
+        self.kwargs = kwargs
+        self.attrs = {
+            "Mounts": [
+                {"Type": "volume", "Name": volume, "Destination": details["bind"]}
+                for volume, details in kwargs.get("volumes", {}).items()
+            ]
+        }
+        self.nginx_conf = kwargs.get("environment", {}).get("NGINX_CONF")
+        self.exec_exit_code = 0
+        self.commands = []
+
+    def exec_run(self, cmd, environment=None):
+        self.commands.append(cmd)
+        if cmd == ["cat", "/etc/nginx/nginx.conf"]:
+            return 0, self.nginx_conf.encode("utf-8")
+        if self.exec_exit_code == 0:
+            self.nginx_conf = environment["NGINX_CONF"]
+            return 0, b""
+        return self.exec_exit_code, b"nginx: configuration test failed"
+
+    def remove(self, force=False):
+        del self.client.running[self.name]
+
+
+class FakeContainers:
+    def __init__(self, client):
+        self.client = client
+
+    def run(self, **kwargs):
+        if kwargs.get("entrypoint") == ["du", "-sb", "/data/databases"]:
+            return b"1000\t/data/databases\n"
+        container = FakeContainer(self.client, **kwargs)
+        self.client.running[container.name] = container
+        return container
+
+    def get(self, name):
+        try:
+            return self.client.running[name]
+        except KeyError:
+            raise docker_sdk.errors.NotFound(name)
+
+
+class FakeVolume:
+    def __init__(self, name):
+        self.name = name
+
+    def remove(self, force=False):
+        pass
+
+
+class FakeVolumes:
+    def __init__(self, names):
+        self.names = names
+
+    def list(self):
+        return [FakeVolume(name) for name in self.names]
+
+    def get(self, name):
+        return FakeVolume(name)
+
+
+class FakeClient:
+    def __init__(self, volumes):
+        self.running = {}
+        self.containers = FakeContainers(self)
+        self.volumes = FakeVolumes(volumes)
+        self.networks = mock.Mock()
+
+
+class FakeMongoClient:
+    def __init__(self, **kwargs):
+        self.db = mock.MagicMock()
+        self.db.list_collection_names.return_value = ["protein", "signature"]
+
+    def __getitem__(self, name):
+        return self.db
+
+    def close(self):
+        pass
+
+
+def neo4j_response(errors):
+    response = mock.Mock()
+    response.json.return_value = {"results": [], "errors": errors}
+    return response
+
+
+@pytest.fixture
+def docker(monkeypatch):
+    # NOTE: The module connects to the docker daemon on import.
+    with mock.patch("docker.from_env"):
+        module = importlib.import_module("nedrexdb.control.docker")
+
+    client = FakeClient(volumes=["nedrex_mongo_1000", "nedrex_neo4j_1000"])
+    monkeypatch.setattr(module, "_client", client)
+    monkeypatch.setattr(module, "_MongoClient", FakeMongoClient)
+    monkeypatch.setattr(module, "get_host_memory", lambda: 16 * _GB)
+    monkeypatch.setattr(module._readiness, "wait_for_mongo", lambda port: None)
+    monkeypatch.setattr(module._readiness, "wait_for_neo4j", lambda http_port, bolt_port: None)
+    monkeypatch.setattr(module._requests, "post", lambda *args, **kwargs: neo4j_response([]))
+    monkeypatch.setattr(
+        nedrexdb.config,
+        "data",
+        {
+            "db": {
+                "mongo_image": "mongo",
+                "mongo_express_image": "mongo-express",
+                "neo4j_image": "neo4j",
+                "volume_root": "nedrex",
+                "mongo_db": "nedrex",
+                "live": {
+                    "container_name": "nedrex_live",
+                    "express_container_name": "nedrex_live_express",
+                    "network": "nedrex_live",
+                    "mongo_port": 27020,
+                    "mongo_express_port": 8081,
+                    "neo4j_http_port": 7474,
+                    "neo4j_bolt_port": 7687,
+                    "warm_up_timeout": 0.05,
+                },
+            },
+            "api": {"node_collections": ["protein", "signature"], "edge_collections": []},
+        },
+    )
+    return module
+
+
+def set_up_blue(docker):
+    """Swaps from the (non blue/green) live instance to blue, then builds newer volumes"""
+    docker.NeDRexLiveInstance().blue_green_swap()
+    docker._client.volumes.names += ["nedrex_mongo_2000", "nedrex_neo4j_2000"]
+
+
+def test_colour_ports(docker):
+    blue, green = docker._NeDRexColourInstance("blue"), docker._NeDRexColourInstance("green")
+    assert (blue.mongo_port, blue.neo4j_http_port, blue.neo4j_bolt_port) == (27120, 7574, 7787)
+    assert (green.mongo_port, green.neo4j_http_port, green.neo4j_bolt_port) == (27220, 7674, 7887)
+
+    docker._config.data["db"]["live"]["colour_port_offset"] = 10
+    assert (blue.mongo_port, green.mongo_port) == (27030, 27040)
+
+    with pytest.raises(ValueError):
+        docker._NeDRexColourInstance("red")
+
+
+def test_proxy_config(docker):
+    config = docker._NeDRexLiveProxy()._generate_config(docker._NeDRexColourInstance("green"))
+
+    assert config.splitlines() == [
+        "events {}",
+        "stream {",
+        "    # active: green",
+        "    server { listen 27017; proxy_pass nedrex_live_green:27017; }",
+        "    server { listen 7474; proxy_pass nedrex_live_green_neo4j:7474; }",
+        "    server { listen 7687; proxy_pass nedrex_live_green_neo4j:7687; }",
+        "}",
+    ]
+
+
+def test_proxy_switch(docker):
+    proxy = docker._NeDRexLiveProxy()
+    proxy.set_up(docker._NeDRexColourInstance("blue"))
+    assert proxy.active_colour() == "blue"
+
+    proxy.switch(docker._NeDRexColourInstance("green"))
+    assert proxy.active_colour() == "green"
+
+    command = proxy.container.commands[-2][2]
+    assert command.index("nginx -t -c /etc/nginx/nginx.conf.new") < command.index("nginx -s reload")
+
+    proxy.container.exec_exit_code = 1
+    with pytest.raises(ProcessError, match="configuration test failed"):
+        proxy.switch(docker._NeDRexColourInstance("blue"))
+    assert proxy.active_colour() == "green"
+
+
+def test_blue_green_swap(docker):
+    set_up_blue(docker)
+    running = docker._client.running
+    assert set(running) == {"nedrex_live_blue", "nedrex_live_blue_neo4j", "nedrex_live_proxy", "nedrex_live_express"}
+    # Blue replaced the classic live instance, so ran on its own.
+    assert "command" not in running["nedrex_live_blue"].kwargs
+    assert running["nedrex_live_blue_neo4j"].kwargs["environment"]["NEO4J_dbms_memory_heap_max__size"] == "4096m"
+
+    docker.NeDRexLiveInstance().blue_green_swap()
+
+    assert set(running) == {"nedrex_live_green", "nedrex_live_green_neo4j", "nedrex_live_proxy", "nedrex_live_express"}
+    assert docker._NeDRexLiveProxy().active_colour() == "green"
+    green_mongo = running["nedrex_live_green"]
+    assert green_mongo.attrs["Mounts"][0]["Name"] == "nedrex_mongo_2000"
+    assert green_mongo.kwargs["ports"] == {27017: ("127.0.0.1", 27220)}
+    # Started next to blue, so with half of mongod's default cache (7.5 GB)
+    assert green_mongo.kwargs["command"] == ["--wiredTigerCacheSizeGB", "3.75"]
+    # ... and half of the Neo4j budget (8 GiB)
+    assert running["nedrex_live_green_neo4j"].kwargs["environment"]["NEO4J_dbms_memory_heap_max__size"] == "2048m"
+
+
+def test_blue_green_swap_failed_warm_up(docker, monkeypatch):
+    set_up_blue(docker)
+    monkeypatch.setattr(docker._requests, "post", lambda *args, **kwargs: neo4j_response(["Neo.DatabaseError"]))
+
+    with pytest.raises(ProcessError, match="Neo.DatabaseError"):
+        docker.NeDRexLiveInstance().blue_green_swap()
+
+    running = docker._client.running
+    assert set(running) == {"nedrex_live_blue", "nedrex_live_blue_neo4j", "nedrex_live_proxy", "nedrex_live_express"}
+    assert docker._NeDRexLiveProxy().active_colour() == "blue"
+
+
+def test_blue_green_swap_newest_volume(docker):
+    docker.NeDRexLiveInstance().blue_green_swap()
+
+    with pytest.raises(docker._AssumptionError):
+        docker.NeDRexLiveInstance().blue_green_swap()
+
+
+def memory_settings(docker, store_size, budget):
+    settings = docker.neo4j_memory_settings(store_size, budget)
+    assert settings["NEO4J_dbms_memory_heap_initial__size"] == settings["NEO4J_dbms_memory_heap_max__size"]
+    return settings["NEO4J_dbms_memory_heap_max__size"], settings["NEO4J_dbms_memory_pagecache_size"]
+
+
+@pytest.mark.parametrize(
+    "store_size,budget,expected",
+    [
+        # Heap: half of the budget, at least 512 MiB, at most 31 GiB
+        (1 * _GB, 8 * _GB, ("4096m", "1228m")),
+        (0, 800 * 1024**2, ("512m", "128m")),
+        (200 * _GB, 100 * _GB, ("31744m", "70656m")),
+        # Page cache: the store plus 20%, within the rest of the budget, at least 128 MiB
+        (10 * _GB, 8 * _GB, ("4096m", "4096m")),
+        (0, 8 * _GB, ("4096m", "128m")),
+    ],
+)
+def test_neo4j_memory_settings(docker, store_size, budget, expected):
+    assert memory_settings(docker, store_size, budget) == expected
+
+
+def test_neo4j_memory_settings_small_host(docker, monkeypatch):
+    logger = mock.Mock()
+    monkeypatch.setattr(docker, "_logger", logger)
+
+    # The floors (512 + 128 MiB) are kept, even though they exceed the budget.
+    assert memory_settings(docker, 1 * _GB, 600 * 1024**2) == ("512m", "128m")
+    logger.warning.assert_called_once()
+
+    logger.reset_mock()
+    memory_settings(docker, 1 * _GB, 2 * _GB)
+    logger.warning.assert_not_called()
+
+
+def test_neo4j_memory_overrides(docker):
+    assert docker._get_neo4j_memory_budget() == 8 * _GB
+    assert docker._get_neo4j_memory_budget(2) == 4 * _GB
+    assert docker.get_neo4j_import_heap_size() == "4096m"
+
+    docker._config.data["db"]["neo4j_memory_fraction"] = 0.25
+    assert docker._get_neo4j_memory_budget() == 4 * _GB
+    assert docker.get_neo4j_import_heap_size() == "2048m"
+
+    docker._config.data["db"].update(neo4j_heap_size="3g", neo4j_pagecache_size="5g", neo4j_import_heap_size="6g")
+    assert memory_settings(docker, 1 * _GB, 8 * _GB) == ("3g", "5g")
+    assert docker.get_neo4j_import_heap_size() == "6g"
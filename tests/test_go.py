@@ -0,0 +1,116 @@
+import pytest
+
+from nedrexdb.db import MongoInstance
+from nedrexdb.db.parsers import go
+
+# NOTE: A trimmed-down go.owl, with a restriction, an axiom annotating a term,
+#       a deprecated (obsolete) term and a non-GO class.
+_GO_OWL = """<?xml version="1.0"?>
+<rdf:RDF xmlns="http://purl.obolibrary.org/obo/go.owl#"
+     xml:base="http://purl.obolibrary.org/obo/go.owl"
+     xmlns:obo="http://purl.obolibrary.org/obo/"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:xsd="http://www.w3.org/2001/XMLSchema#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+     xmlns:oboInOwl="http://www.geneontology.org/formats/oboInOwl#">
+    <owl:Ontology rdf:about="http://purl.obolibrary.org/obo/go.owl"/>
+    <owl:AnnotationProperty rdf:about="http://purl.obolibrary.org/obo/IAO_0000115">
+        <rdfs:label>definition</rdfs:label>
+    </owl:AnnotationProperty>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/GO_0000001">
+        <rdfs:subClassOf rdf:resource="http://purl.obolibrary.org/obo/GO_0000002"/>
+        <rdfs:subClassOf>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="http://purl.obolibrary.org/obo/BFO_0000050"/>
+                <owl:someValuesFrom rdf:resource="http://purl.obolibrary.org/obo/GO_0000004"/>
+            </owl:Restriction>
+        </rdfs:subClassOf>
+        <obo:IAO_0000115>The distribution of mitochondria.</obo:IAO_0000115>
+        <oboInOwl:hasExactSynonym>mitochondrial migration</oboInOwl:hasExactSynonym>
+        <oboInOwl:hasExactSynonym>mitochondrion distribution</oboInOwl:hasExactSynonym>
+        <oboInOwl:hasNarrowSynonym>mitochondrial inheritance</oboInOwl:hasNarrowSynonym>
+        <oboInOwl:id>GO:0000001</oboInOwl:id>
+        <rdfs:label>mitochondrion inheritance</rdfs:label>
+    </owl:Class>
+    <owl:Axiom>
+        <owl:annotatedSource rdf:resource="http://purl.obolibrary.org/obo/GO_0000001"/>
+        <owl:annotatedProperty rdf:resource="http://purl.obolibrary.org/obo/IAO_0000115"/>
+        <owl:annotatedTarget>The distribution of mitochondria.</owl:annotatedTarget>
+        <oboInOwl:hasDbXref>GOC:mcc</oboInOwl:hasDbXref>
+    </owl:Axiom>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/GO_0000002">
+        <oboInOwl:id>GO:0000002</oboInOwl:id>
+        <rdfs:label>mitochondrial genome maintenance</rdfs:label>
+    </owl:Class>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/GO_0000003">
+        <rdfs:subClassOf rdf:resource="http://purl.obolibrary.org/obo/GO_0000002"/>
+        <oboInOwl:id>GO:0000003</oboInOwl:id>
+        <rdfs:label>obsolete reproduction</rdfs:label>
+        <owl:deprecated rdf:datatype="http://www.w3.org/2001/XMLSchema#boolean">true</owl:deprecated>
+    </owl:Class>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/BFO_0000003">
+        <rdfs:label>occurrent</rdfs:label>
+    </owl:Class>
+</rdf:RDF>
+"""
+
+
+class FakeCollection:
+    def __init__(self):
+        self.requests = []
+
+    def bulk_write(self, requests):
+        self.requests += requests
+
+
+class FakeDB(dict):
+    def __missing__(self, key):
+        self[key] = FakeCollection()
+        return self[key]
+
+
+@pytest.fixture
+def go_owl(tmp_path):
+    path = tmp_path / "go.owl"
+    path.write_text(_GO_OWL.lstrip())
+    return path
+
+
+def test_iter_go_terms(go_owl):
+    # Matches the terms built from the rdflib graph before the parser streamed go.owl
+    terms = [
+        (term.primary_id, term.is_deprecated, term.display_name, term.synonyms, term.description, term.is_a)
+        for term in go.iter_go_terms(go_owl)
+    ]
+    assert terms == [
+        (
+            "go.0000001",
+            False,
+            "mitochondrion inheritance",
+            ["mitochondrial migration", "mitochondrion distribution"],
+            "The distribution of mitochondria.",
+            ["go.0000002"],
+        ),
+        ("go.0000002", False, "mitochondrial genome maintenance", [], None, []),
+        ("go.0000003", True, "obsolete reproduction", [], None, ["go.0000002"]),
+    ]
+
+
+def test_parse_go(go_owl, monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(MongoInstance, "DB", db, raising=False)
+    monkeypatch.setattr(go, "get_file_location", lambda label: go_owl)
+
+    go.parse_go()
+
+    # Deprecated terms are skipped, but their relationships are kept.
+    terms = {request._filter["primaryDomainId"]: request._doc for request in db["go"].requests}
+    assert list(terms) == ["go.0000001", "go.0000002"]
+    assert terms["go.0000001"]["$set"]["displayName"] == "mitochondrion inheritance"
+
+    relationships = [
+        (request._filter["sourceDomainId"], request._filter["targetDomainId"])
+        for request in db["go_is_subtype_of_go"].requests
+    ]
+    assert relationships == [("go.0000001", "go.0000002"), ("go.0000003", "go.0000002")]
@@ -0,0 +1,42 @@
+from nedrexdb.db.parsers import hpa
+
+_ENTRIES = b"""<root>
+<entry>
+  <identifier>
+    <xref db="NCBI GeneID" id="1"/>
+    <xref db="Uniprot/SWISSPROT" id="P1"/>
+  </identifier>
+  <tissueExpression>
+    <data>
+      <tissue ontologyTerms="UBERON:0000001,UBERON:0000002">liver</tissue>
+      <level type="expression">High</level>
+    </data>
+    <data><tissue>skin</tissue><level type="expression">Low</level></data>
+  </tissueExpression>
+  <rnaExpression>
+    <data>
+      <tissue ontologyTerms="UBERON:0000001">liver</tissue>
+      <level type="normalizedRNAExpression" expRNA="1.5"/>
+      <level type="RNAExpression" expRNA="2"/>
+    </data>
+  </rnaExpression>
+</entry>
+<entry>
+  <identifier><xref db="NCBI GeneID" id="9"/></identifier>
+  <rnaExpression>
+    <data><tissue ontologyTerms="UBERON:0000001">liver</tissue><level type="RNAExpression" expRNA="3"/></data>
+  </rnaExpression>
+</entry>
+</root>"""
+
+
+def test_parse_entries(monkeypatch):
+    monkeypatch.setattr(hpa, "_genes", {"entrez.1"})
+    monkeypatch.setattr(hpa, "_proteins", {"uniprot.P1"})
+    monkeypatch.setattr(hpa, "_tissues", {"uberon.0000001"})
+
+    # Only known genes, proteins and tissues are returned, as plain tuples.
+    assert hpa._parse_entries(_ENTRIES) == [
+        ([("entrez.1", "uberon.0000001", 2.0, 1.5, None)], [("uniprot.P1", "uberon.0000001", "High")]),
+        ([], []),
+    ]
@@ -0,0 +1,69 @@
+from nedrexdb.db import MongoInstance
+from nedrexdb.db.parsers.iid import IIDColumns, IIDParser, IIDRow
+
+_HEADER = ["uniprot1", "uniprot2", "methods", "evidence_type", "nucleus", "synovial membrane", "cytoplasm"]
+_ROWS = [
+    ["P1", "P2", "MI:1 | MI:2", "exp", "2", "2", "2"],
+    # Truncated within the context columns
+    ["P1", "P3", "-", "pred", "2"],
+    # Truncated before the evidence types
+    ["P2", "P3", "MI:1"],
+    ["P1", "P9", "MI:1", "exp", "2", "2", "2"],
+]
+
+
+class FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.requests = []
+
+    def find(self, query, projection=None):
+        return iter(self.docs)
+
+    def bulk_write(self, requests):
+        self.requests += requests
+
+
+class FakeDB(dict):
+    def __missing__(self, key):
+        self[key] = FakeCollection()
+        return self[key]
+
+
+def test_iid_row():
+    columns = IIDColumns(_HEADER)
+    ppi = IIDRow(_ROWS[0], columns).parse()
+
+    assert ppi.methods == ["MI:1", "MI:2"]
+    assert ppi.evidenceTypes == ["exp"]
+    # Labels are in the order of the category, not of the header.
+    assert ppi.subcellularLocations == ["Cytoplasm", "Nucleus"]
+    assert ppi.jointTissues == ["Synovial membrane"]
+
+
+def test_iid_short_rows():
+    columns = IIDColumns(_HEADER)
+
+    assert columns.pad(_ROWS[0]) is _ROWS[0]
+    assert columns.pad(_ROWS[1]) == ["P1", "P3", "-", "pred", "2", "", ""]
+    assert columns.pad(_ROWS[2]) is None
+
+    ppi = IIDRow(columns.pad(_ROWS[1]), columns).parse()
+    assert (ppi.methods, ppi.subcellularLocations, ppi.jointTissues) == ([], ["Nucleus"], [])
+
+
+def test_iid_parser(tmp_path, monkeypatch):
+    path = tmp_path / "human_annotated_PPIs.txt"
+    path.write_text("\n".join("\t".join(row) for row in [_HEADER] + _ROWS) + "\n")
+
+    db = FakeDB()
+    db["protein"] = FakeCollection({"primaryDomainId": f"uniprot.P{i}"} for i in range(1, 4))
+    monkeypatch.setattr(MongoInstance, "DB", db, raising=False)
+
+    IIDParser(path).parse()
+
+    requests = db["protein_interacts_with_protein"].requests
+    assert [(request._filter["memberOne"], request._filter["memberTwo"]) for request in requests] == [
+        ("uniprot.P1", "uniprot.P2"),
+        ("uniprot.P1", "uniprot.P3"),
+    ]
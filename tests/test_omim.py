@@ -0,0 +1,97 @@
+import tracemalloc
+
+import pytest
+
+from nedrexdb.db import MongoInstance
+from nedrexdb.db.parsers.omim import GeneMap2Parser, OMIMRow
+
+N_GENES = 500
+N_ROWS = 20_000
+
+
+class FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.batch_sizes = []
+
+    def find(self, query, projection=None):
+        return iter(self.docs)
+
+    def bulk_write(self, requests):
+        self.batch_sizes.append(len(requests))
+
+
+class FakeDB(dict):
+    def __missing__(self, key):
+        self[key] = FakeCollection()
+        return self[key]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeDB()
+    db["gene"] = FakeCollection({"primaryDomainId": f"entrez.{i}"} for i in range(N_GENES))
+    db["disorder"] = FakeCollection(
+        {"primaryDomainId": f"mondo.{i:07}", "domainIds": [f"omim.{100_000 + i}"]} for i in range(N_GENES)
+    )
+    monkeypatch.setattr(MongoInstance, "DB", db, raising=False)
+    return db
+
+
+@pytest.fixture
+def genemap2(tmp_path):
+    path = tmp_path / "genemap2.txt"
+    with path.open("w") as f:
+        f.write("# Copyright (c) 1966-2021 Johns Hopkins University\n")
+        for i in range(N_ROWS):
+            gene = i % (2 * N_GENES)  # Half of the genes are not in the database.
+            mim1, mim2 = 100_000 + i % N_GENES, 100_000 + (i + 1) % N_GENES
+            phenotypes = f"Some disorder, {mim1} (3), Autosomal dominant; {{Susceptibility to x}}, {mim2} (2)"
+            row = [
+                "chr1",
+                "1",
+                "2",
+                "1p36",
+                "",
+                f"{600_000 + i}",
+                "ABC",
+                "Gene",
+                "ABC",
+                f"{gene}",
+                "",
+                "",
+                phenotypes,
+                "",
+            ]
+            f.write("\t".join(row) + "\n")
+    return path
+
+
+def test_omim_row_phenotypes():
+    row = {"Phenotypes": "Disorder A, 123456 (3); ?Disorder B, 234567 (1); {Disorder C}, 345678 (2); Disorder D"}
+    assert list(OMIMRow(row).iter_phenotypes()) == [
+        ("123456", 3, []),
+        ("234567", 1, ["provisional"]),
+        ("345678", 2, ["susceptibility"]),
+    ]
+
+
+def test_genemap2_parse(fake_db, genemap2):
+    GeneMap2Parser(genemap2).parse()
+
+    batch_sizes = fake_db["gene_associated_with_disorder"].batch_sizes
+    assert sum(batch_sizes) == N_ROWS  # Two phenotypes per row, half of the rows are skipped.
+    assert max(batch_sizes) == 1_000
+
+
+def test_genemap2_parse_memory(fake_db, genemap2):
+    # NOTE: Regression test for OMIM ingestion holding every update in memory;
+    #       with bounded batches, peak memory is independent of the file size.
+    tracemalloc.start()
+    try:
+        GeneMap2Parser(genemap2).parse()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 8 * 1024 * 1024
@@ -0,0 +1,213 @@
+import gzip
+import io
+import json
+import os
+from xml.etree import ElementTree
+
+import pytest
+
+from nedrexdb.db.parsers import (
+    _JSONStream,
+    _gunzip_stream,
+    _iter_line_blocks,
+    _iter_obo_graph_json,
+    _iter_tsv_chunks,
+    _iter_xml_blocks,
+)
+from nedrexdb.db.parsers.drug_central import DrugCentralDump
+from nedrexdb.exceptions import ProcessError
+
+
+@pytest.fixture
+def obo_graph_json(tmp_path):
+    graph = {
+        "graphs": [
+            {
+                "id": "http://purl.obolibrary.org/obo/test.owl",
+                "meta": {"basicPropertyValues": [{"pred": "version", "val": "}]"}]},
+                "nodes": [{"id": f"node_{i}", "lbl": 'né"de' * i, "weight": i * 1.5} for i in range(100)],
+                "edges": [{"sub": f"node_{i}", "pred": "is_a", "obj": "node_0"} for i in range(1, 20)],
+                "equivalentNodesSets": [],
+            },
+            {"id": "second", "nodes": [{"id": "ignored"}]},
+        ]
+    }
+
+    path = tmp_path / "graph.json"
+    path.write_text(json.dumps(graph, indent=2))
+    return path, graph
+
+
+class TestJSONStream:
+    @pytest.mark.parametrize("block_size", [1, 7, 1024 * 1024])
+    def test_iter_obo_graph_json(self, obo_graph_json, block_size):
+        path, graph = obo_graph_json
+
+        items = list(_iter_obo_graph_json(path, block_size=block_size))
+        assert [item for key, item in items if key == "nodes"] == graph["graphs"][0]["nodes"]
+        assert [item for key, item in items if key == "edges"] == graph["graphs"][0]["edges"]
+        assert [key for key, _ in items] == ["nodes"] * 100 + ["edges"] * 19
+
+    def test_iter_obo_graph_json_selected_keys(self, obo_graph_json):
+        path, graph = obo_graph_json
+        items = list(_iter_obo_graph_json(path, keys=("edges",)))
+        assert [item for _, item in items] == graph["graphs"][0]["edges"]
+
+    @pytest.mark.parametrize("block_size", [1, 2, 5, 1024])
+    def test_skip(self, block_size):
+        values = ['"a\\"]}"', '{"a": ["]", "\\\\", {"b": "{"}], "c": 1}', "[[], {}, [1, [2, [3]]]]", "-1.5e3", "null"]
+        text = "[" + ", ".join(values) + ', "end"]'
+        stream = _JSONStream(io.StringIO(text), block_size=block_size)
+
+        stream.expect("[")
+        for _ in values:
+            stream.skip()
+            stream.expect(",")
+        assert stream.value() == "end"
+        stream.expect("]")
+
+    def test_skip_truncated(self):
+        stream = _JSONStream(io.StringIO('{"a": [1, "]"'), block_size=3)
+        with pytest.raises(ValueError):
+            stream.skip()
+
+    def test_iter_obo_graph_json_stops_after_keys(self, tmp_path):
+        # Anything after the requested keys is not read (here, truncated JSON).
+        path = tmp_path / "graph.json"
+        path.write_text('{"graphs": [{"nodes": [{"id": "a"}], "edges": [{"sub": "a"}], "meta": {"x": [')
+
+        assert list(_iter_obo_graph_json(path, block_size=4)) == [("nodes", {"id": "a"}), ("edges", {"sub": "a"})]
+
+    def test_numbers_split_across_blocks(self):
+        stream = _JSONStream(io.StringIO("[12345678901234, 2.5e10, {}]"), block_size=3)
+        assert list(stream.iter_array()) == [12345678901234, 2.5e10, {}]
+
+    def test_invalid_json(self):
+        stream = _JSONStream(io.StringIO('{"a": [1, 2'), block_size=2)
+        with pytest.raises(ValueError):
+            for _ in stream.iter_object_keys():
+                list(stream.iter_array())
+
+
+@pytest.mark.parametrize("data", [b"a\tb\nccc\n\ndd\n", b"a\tb\nccc\n\ndd", b""])
+@pytest.mark.parametrize("block_size", [1, 3, 1024])
+def test_iter_line_blocks(data, block_size):
+    blocks = list(_iter_line_blocks(io.BytesIO(data), block_size))
+    assert b"".join(blocks) == data
+    assert all(block.endswith(b"\n") for block in blocks[:-1])
+
+
+def test_iter_tsv_chunks(tmp_path):
+    path = tmp_path / "data.tsv.gz"
+    path.write_bytes(gzip.compress(b"id\tname\tscore\n1\t\t0.5\n2\tNA\t1\n3\tb\t2\n"))
+
+    chunks = list(_iter_tsv_chunks(path, 2, usecols=["id", "name"]))
+    assert [chunk.to_dict("records") for chunk in chunks] == [
+        [{"id": "1", "name": ""}, {"id": "2", "name": "NA"}],
+        [{"id": "3", "name": "b"}],
+    ]
+
+
+_XML = b"""<?xml version="1.0"?>
+<entryList>
+<entry id="1"><name>a</name></entry>
+<entry id="2"><entrySet/><name>b &lt;c&gt;</name></entry>
+<entry>
+  <name>d</name>
+</entry>
+</entryList>
+"""
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 40, 1024])
+def test_iter_xml_blocks(block_size):
+    # Small block sizes split tags (and elements) across blocks.
+    blocks = list(_iter_xml_blocks(io.BytesIO(_XML), b"entry", block_size))
+
+    entries = [(entry.get("id"), entry.findtext("name")) for block in blocks for entry in ElementTree.fromstring(block)]
+    assert entries == [("1", "a"), ("2", "b <c>"), (None, "d")]
+    if block_size == 1024:
+        assert len(blocks) == 1
+
+
+def test_iter_xml_blocks_no_match():
+    assert list(_iter_xml_blocks(io.BytesIO(_XML), b"entr", 8)) == []
+    assert list(_iter_xml_blocks(io.BytesIO(b""), b"entry")) == []
+
+
+def test_gunzip_stream(tmp_path):
+    data = bytes(range(256)) * 10_000
+    path = tmp_path / "data.gz"
+    path.write_bytes(gzip.compress(data))
+
+    with _gunzip_stream(path) as f:
+        assert f.read() == data
+
+    # Stopping early does not fail.
+    with _gunzip_stream(path) as f:
+        f.read(10)
+
+
+def test_gunzip_stream_truncated(tmp_path):
+    compressed = gzip.compress(os.urandom(1_000_000))
+    path = tmp_path / "truncated.gz"
+    path.write_bytes(compressed[: len(compressed) // 2])
+
+    with pytest.raises(ProcessError):
+        with _gunzip_stream(path) as f:
+            f.read()
+
+
+_DRUG_CENTRAL_DUMP = b"""--
+-- PostgreSQL database dump
+--
+
+COPY public.structures (id, name) FROM stdin;
+1\tignored
+\\.
+
+COPY public.identifier (id, identifier, id_type, struct_id, parent_match) FROM stdin;
+1\tDB00001\tDRUGBANK_ID\t10\t\\N
+2\tC0001\tUMLSCUI\t10\t\\N
+3\tDB\\\\0\\t2\tDRUGBANK_ID\t11\tt
+4\tDB\\1010003\tDRUGBANK_ID\t\\N\t\\N
+\\.
+
+COPY public.act_table_full (act_id, struct_id, target_id, accession, moa) FROM stdin;
+1\t10\t5\tP12345\t1
+2\t11\t6\t\\N\t\\N
+3\t11\t7\tQ67890|Q11111\t\\N
+\\.
+
+COPY public.omop_relationship (id, struct_id, concept_id, relationship_name, concept_name, snomed_conceptid) FROM stdin;
+1\t10\t100\tindication\tFever\t386661006
+2\t10\t101\tcontraindication\tX\t\\N
+3\t11\t102\toff-label use\tY\t22298006
+\\.
+"""
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_drug_central_dump(tmp_path, compressed):
+    path = tmp_path / ("drugcentral.dump.sql.gz" if compressed else "drugcentral.dump.sql")
+    path.write_bytes(gzip.compress(_DRUG_CENTRAL_DUMP) if compressed else _DRUG_CENTRAL_DUMP)
+
+    dump = DrugCentralDump(path)
+    dump.load()
+
+    assert dump._tables["identifier"] == [
+        (10, "DB00001", "DRUGBANK_ID"),
+        (10, "C0001", "UMLSCUI"),
+        (11, "DB\\0\t2", "DRUGBANK_ID"),
+        (None, "DBA0003", "DRUGBANK_ID"),
+    ]
+    assert dump._tables["act_table_full"] == [(10, "P12345", 1), (11, None, None), (11, "Q67890|Q11111", None)]
+    assert dump._tables["omop_relationship"] == [
+        (10, 386661006, "indication"),
+        (10, None, "contraindication"),
+        (11, 22298006, "off-label use"),
+    ]
+
+    assert list(dump._iter_drugbank_identifiers()) == [(10, "DB00001"), (11, "DB\\0\t2"), (None, "DBA0003")]
+    assert list(dump._iter_targets()) == [(10, "P12345", 1), (11, "Q67890|Q11111", None)]
+    assert list(dump._iter_omop_relationships({"indication", "contraindication"})) == [(10, 386661006, "indication")]
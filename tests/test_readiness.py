@@ -0,0 +1,54 @@
+import socket
+import threading
+
+import pytest
+
+from nedrexdb.control import readiness
+from nedrexdb.exceptions import ProcessError
+
+
+def test_wait_until_backs_off(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(readiness._time, "sleep", sleeps.append)
+
+    results = iter([ConnectionError("refused"), False, False, False, True])
+
+    def check():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    readiness.wait_until(check, "service", timeout=60, initial_delay=0.5, max_delay=2)
+    assert sleeps == [0.5, 1, 2, 2]
+
+
+def test_wait_until_times_out():
+    def check():
+        raise ConnectionError("refused")
+
+    with pytest.raises(ProcessError, match="refused"):
+        readiness.wait_until(check, "service", timeout=0.05, initial_delay=0.01)
+
+
+@pytest.mark.parametrize("reply,expected", [(b"\x00\x00\x04\x04", True), (b"\x00\x00\x00\x00", False)])
+def test_neo4j_bolt_is_ready(reply, expected):
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    received = []
+
+    def serve():
+        con, _ = server.accept()
+        with con:
+            received.append(con.recv(20))
+            con.sendall(reply)
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    try:
+        assert readiness.neo4j_bolt_is_ready(port, host="127.0.0.1") is expected
+    finally:
+        thread.join()
+        server.close()
+
+    assert received == [readiness._BOLT_HANDSHAKE]